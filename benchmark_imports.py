@@ -0,0 +1,60 @@
+"""Compare start-up import cost of the monitoring path with the UI path.
+
+Each case is imported in a fresh interpreter several times; the median wall
+time and the number of loaded modules are printed. The "eager" case imports
+everything the single-file script used to load at start-up.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CASES = [
+    ("monitor (daemon path)", "import discord_trigger_message.cli, discord_trigger_message.monitor"),
+    ("menu and Tk previews", "import discord_trigger_message.cli, discord_trigger_message.ui"),
+    ("eager (old single file)", "import discord_trigger_message.cli, discord_trigger_message.ui, discord_trigger_message.metrics, pyfiglet, tabulate, tkinter.ttk, PIL.ImageTk"),
+]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+try:
+    exec({code!r})
+except Exception as e:
+    print("error", type(e).__name__, e)
+    sys.exit(1)
+print(time.perf_counter() - start, len(sys.modules))
+"""
+
+def measure(code, runs):
+    times = []
+    modules = 0
+    here = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(code=code)],
+            capture_output=True, text=True, cwd=here
+        )
+        output = result.stdout.strip().split()
+        if result.returncode != 0 or len(output) != 2:
+            return None, result.stdout.strip() or result.stderr.strip().splitlines()[-1]
+        times.append(float(output[0]) * 1000)
+        modules = int(output[1])
+    return statistics.median(times), modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of the monitoring and UI paths")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per case")
+    args = parser.parse_args()
+
+    for name, code in CASES:
+        median, modules = measure(code, args.runs)
+        if median is None:
+            print(f"{name:<26} failed: {modules}")
+        else:
+            print(f"{name:<26} {median:8.1f} ms  {modules:4d} modules")
+
+if __name__ == "__main__":
+
+    main()
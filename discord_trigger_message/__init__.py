@@ -0,0 +1,5 @@
+"""Discord Trigger Message: watch a Discord window with OCR and answer trigger keywords.
+
+The monitoring path (capture, OCR, matching, sending) lives in plain modules;
+the menu, calibration and Tk previews are in ``ui`` and are only imported when used.
+"""
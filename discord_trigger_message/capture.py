@@ -0,0 +1,288 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from PIL import ImageGrab, Image, ImageDraw, ImageFont, ImageChops
+import numpy as np
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+def area_bbox(area):
+    return (
+        area["left"],
+        area["top"],
+        area["left"] + area["width"],
+        area["top"] + area["height"]
+    )
+
+class CapturePlanner:
+    """Works out one bounding grab for all areas and where each area sits inside it"""
+
+    def __init__(self, areas, max_overhead=4.0):
+        boxes = {name: area_bbox(area) for name, area in areas.items()}
+        self.bbox = (
+            min(box[0] for box in boxes.values()),
+            min(box[1] for box in boxes.values()),
+            max(box[2] for box in boxes.values()),
+            max(box[3] for box in boxes.values())
+        )
+        left, top = self.bbox[0], self.bbox[1]
+        self.crops = {name: (box[0] - left, box[1] - top, box[2] - left, box[3] - top) for name, box in boxes.items()}
+        self.boxes = boxes
+
+        union_pixels = (self.bbox[2] - self.bbox[0]) * (self.bbox[3] - self.bbox[1])
+        area_pixels = sum((box[2] - box[0]) * (box[3] - box[1]) for box in boxes.values())
+        self.single_grab = len(boxes) == 1 or union_pixels <= area_pixels * max_overhead
+
+class ScreenFrameSource:
+    """Grabs every requested area from the live screen in one capture per tick.
+
+    Uses MSS (XShm on Linux, BitBlt on Windows) when installed and PIL's
+    ImageGrab otherwise. The grab lands in a reused buffer and each area is
+    cut out of it; areas that are far apart are grabbed separately instead.
+    """
+
+    def __init__(self, backend="auto"):
+        self.use_mss = mss is not None and backend in ("auto", "mss")
+        if backend == "mss" and mss is None:
+            logging.warning("mss is not installed, falling back to PIL ImageGrab")
+        self.local = threading.local()
+        self.plans = {}
+
+    def plan(self, areas):
+        key = tuple((name, area_bbox(area)) for name, area in areas.items())
+        plan = self.plans.get(key)
+        if plan is None:
+            self.plans.clear()
+            plan = self.plans[key] = CapturePlanner(areas)
+        return plan
+
+    def grab_pixels(self, bbox):
+        grabber = getattr(self.local, "mss", None)
+        if grabber is None:
+            grabber = self.local.mss = mss.mss()
+        shot = grabber.grab({
+            "left": bbox[0],
+            "top": bbox[1],
+            "width": bbox[2] - bbox[0],
+            "height": bbox[3] - bbox[1]
+        })
+        bgra = np.frombuffer(shot.bgra, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        pixels = getattr(self.local, "pixels", None)
+        if pixels is None or pixels.shape[:2] != bgra.shape[:2]:
+            pixels = self.local.pixels = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+        pixels[...] = bgra[:, :, 2::-1]
+        return pixels
+
+    def grab(self, bbox):
+        if self.use_mss:
+            return self.grab_pixels(bbox)
+        return ImageGrab.grab(bbox=bbox)
+
+    def crop(self, capture, box):
+        if isinstance(capture, np.ndarray):
+            # Copied once: frames stay in flight in the OCR pool while the buffer is refilled
+            return Image.fromarray(capture[box[1]:box[3], box[0]:box[2]])
+        return capture.crop(box)
+
+    def capture(self, areas):
+        plan = self.plan(areas)
+        if not plan.single_grab:
+            return {
+                name: self.crop(self.grab(box), (0, 0, box[2] - box[0], box[3] - box[1]))
+                for name, box in plan.boxes.items()
+            }
+
+        capture = self.grab(plan.bbox)
+        return {name: self.crop(capture, box) for name, box in plan.crops.items()}
+
+    def labels(self):
+        return None
+
+class RecordingFrameSource:
+    """Wraps another source and saves every captured crop with a timestamp"""
+
+    def __init__(self, source, directory):
+        self.source = source
+        self.directory = directory
+        self.index = 0
+        self.start = time.perf_counter()
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = open(os.path.join(directory, "manifest.jsonl"), "a")
+
+    def capture(self, areas):
+        images = self.source.capture(areas)
+        self.index += 1
+        files = {}
+        for name, image in images.items():
+            filename = f"{self.index:06d}_{name}.png"
+            image.save(os.path.join(self.directory, filename))
+            files[name] = filename
+        entry = {"t": round(time.perf_counter() - self.start, 4), "images": files, "expect": []}
+        self.manifest.write(json.dumps(entry) + "\n")
+        self.manifest.flush()
+        return images
+
+    def labels(self):
+        return None
+
+    def close(self):
+        self.manifest.close()
+
+class ReplayFrameSource:
+    """Feeds recorded crops back in order, one manifest entry per capture"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.jsonl"), "r") as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        self.position = -1
+
+    @property
+    def exhausted(self):
+        return self.position + 1 >= len(self.entries)
+
+    def capture(self, areas):
+        self.position += 1
+        entry = self.entries[self.position]
+        images = {}
+        for name in areas:
+            filename = entry["images"].get(name)
+            if filename is not None:
+                with Image.open(os.path.join(self.directory, filename)) as image:
+                    images[name] = image.convert("RGB")
+        return images
+
+    def labels(self):
+        return self.entries[self.position].get("expect", [])
+
+class SyntheticFrameSource:
+    """Renders a scrolling Discord-like chat with PIL and labels the keyword messages"""
+
+    background = (49, 51, 56)
+    foreground = (219, 222, 225)
+    vocabulary = (
+        "the", "a", "is", "anyone", "here", "playing", "tonight", "lol", "nice", "ok",
+        "what", "time", "server", "update", "patch", "notes", "gg", "thanks", "see", "you"
+    )
+
+    def __init__(self, width=1365, height=177, keywords=(), frames=500, message_rate=0.3,
+                 keyword_rate=0.2, authors=("alice", "bob", "carol"), target_username=None, seed=0):
+        self.width = width
+        self.height = height
+        self.keywords = [keyword for keyword in keywords if keyword]
+        self.frames = frames
+        self.message_rate = message_rate
+        self.keyword_rate = keyword_rate
+        self.authors = list(authors)
+        self.target_username = target_username
+        if target_username and target_username not in self.authors:
+            self.authors.append(target_username)
+        self.random = random.Random(seed)
+        self.messages = []
+        self.position = 0
+        self.current_labels = []
+        self.line_height = 22
+        try:
+            self.font = ImageFont.load_default(size=16)
+            self.stamp_font = ImageFont.load_default(size=12)
+        except TypeError:
+            self.font = self.stamp_font = ImageFont.load_default()
+
+    @property
+    def exhausted(self):
+        return self.position >= self.frames
+
+    def next_message(self):
+        author = self.random.choice(self.authors)
+        words = self.random.choices(self.vocabulary, k=self.random.randint(3, 10))
+        labels = []
+        if self.keywords and self.random.random() < self.keyword_rate:
+            keyword = self.random.choice(self.keywords)
+            words.insert(self.random.randint(0, len(words)), keyword)
+            if not self.target_username or author == self.target_username:
+                labels.append(keyword)
+        return author, " ".join(words), labels
+
+    def render_chat(self):
+        rows = []
+        previous_author = None
+        for author, text, stamp in self.messages:
+            if author != previous_author:
+                rows.append((author, f"Today at {stamp}"))
+                previous_author = author
+            rows.append((text, None))
+
+        image = Image.new("RGB", (self.width, self.height), self.background)
+        draw = ImageDraw.Draw(image)
+        y = self.height - self.line_height
+        for text, stamp in reversed(rows):
+            if y < -self.line_height:
+                break
+            draw.text((72, y + 3), text, fill=self.foreground, font=self.font)
+            if stamp:
+                # Headers are drawn like Discord's: the timestamp in a smaller font after the name
+                left = 72 + draw.textlength(text, font=self.font) + 8
+                draw.text((left, y + 6), stamp, fill=self.foreground, font=self.stamp_font)
+            y -= self.line_height
+        return image
+
+    def render_username(self, area):
+        image = Image.new("RGB", (area["width"], area["height"]), self.background)
+        if self.messages:
+            ImageDraw.Draw(image).text((4, 4), self.messages[-1][0], fill=self.foreground, font=self.font)
+        return image
+
+    def capture(self, areas):
+        self.position += 1
+        self.current_labels = []
+        if self.random.random() < self.message_rate:
+            author, text, labels = self.next_message()
+            minutes = 12 * 60 + self.position // 60
+            self.messages.append((author, text, f"{minutes // 60}:{minutes % 60:02d}"))
+            self.messages = self.messages[-(self.height // self.line_height + 2):]
+            self.current_labels = labels
+
+        images = {}
+        for name, area in areas.items():
+            if name.rsplit("/", 1)[-1] == "message":
+                images[name] = self.render_chat()
+            else:
+                images[name] = self.render_username(area)
+        return images
+
+    def labels(self):
+        return self.current_labels
+
+class FrameChangeGate:
+    """Cheap change detection run on raw grabs before any resize or OCR"""
+
+    def __init__(self, threshold=12, downsample=4):
+        self.threshold = threshold
+        self.downsample = max(1, int(downsample))
+        self.previous = {}
+
+    def reset(self):
+        self.previous.clear()
+
+    def has_changed(self, name, screenshot):
+        thumbnail = screenshot.convert("L")
+        if self.downsample > 1:
+            thumbnail = thumbnail.reduce(self.downsample)
+
+        previous = self.previous.get(name)
+        self.previous[name] = thumbnail
+
+        if previous is None or previous.size != thumbnail.size:
+            return True
+        if previous.tobytes() == thumbnail.tobytes():
+            return False
+
+        diff = ImageChops.difference(previous, thumbnail)
+        return diff.getextrema()[1] > self.threshold
+
@@ -0,0 +1,194 @@
+import argparse
+import json
+import logging
+import os
+import signal
+
+from .capture import ReplayFrameSource, SyntheticFrameSource
+from .monitor import DiscordMonitor
+from .replay import record_frames, run_replay, print_report
+from .soak import run_soak, print_soak_report
+from .sessionlog import SessionLog, print_stats
+from .tuning import tune_ocr
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Discord Trigger Message")
+    parser.add_argument("--record", metavar="DIR", help="record message/username area captures to DIR and exit")
+    parser.add_argument("--frames", type=int, default=300, help="number of frames to record or synthesize")
+    parser.add_argument("--replay", metavar="DIR", help="run a recorded capture directory through the pipeline headlessly")
+    parser.add_argument("--synthetic", action="store_true", help="run a synthetic PIL-rendered chat through the pipeline headlessly")
+    parser.add_argument("--keywords", help="comma-separated keywords overriding the config for replay runs")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for synthetic frames")
+    parser.add_argument("--report", metavar="FILE", help="write the replay report as JSON to FILE")
+    parser.add_argument("--tune", metavar="DIR", help="search OCR settings on labelled captures in DIR and save the best")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="recall the tuner may give up for speed (0-1)")
+    parser.add_argument("--daemon", action="store_true", help="run the monitor without the menu until SIGTERM, reloading the config when it changes")
+    parser.add_argument("--config", default="monitor_config.json", metavar="PATH", help="config file to use (default: monitor_config.json)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="serve JSON metrics on 127.0.0.1:PORT in daemon mode (0 disables)")
+    parser.add_argument("--stats", action="store_true", help="print session and trigger stats from the session log index and exit")
+    parser.add_argument("--rebuild-index", action="store_true", help="with --stats, rebuild the index by rereading the session log")
+    parser.add_argument("--soak", type=float, metavar="HOURS", help="drive the monitor with HOURS of simulated synthetic traffic and check resource budgets")
+    parser.add_argument("--soak-rate", type=float, default=2.0, metavar="HZ", help="scans per simulated second during a soak run (default: 2)")
+    parser.add_argument("--budget", action="append", default=[], metavar="KEY=VALUE", help="override a soak budget, e.g. max_rss_mb=300 (repeatable)")
+    return parser.parse_args()
+
+def show_stats(args):
+    try:
+        with open(args.config, "r") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        config = {}
+    print_stats(SessionLog.from_config(config).stats(rebuild=args.rebuild_index))
+
+def run_daemon(args, monitor):
+    """Run the monitor loop as a supervised service: no menu or hotkeys, SIGTERM stops it and config edits apply live"""
+    if not monitor.config["discord_token"] or not all(rule.channel_id for rule in monitor.trigger_rules()):
+        raise SystemExit("Discord token or channel ID not configured")
+
+    def request_stop(signum, frame):
+        logging.info(f"Received signal {signum}, stopping")
+        monitor.stop_event.set()
+
+    def request_reload(signum, frame):
+        monitor.config_mtime = None
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, request_reload)
+
+    from .metrics import MetricsServer
+
+    port = args.metrics_port if args.metrics_port is not None else monitor.config.get("metrics_port", 9108)
+    metrics = None
+    if port:
+        try:
+            metrics = MetricsServer(monitor, host=monitor.config.get("metrics_host", "127.0.0.1"), port=port)
+            metrics.start()
+        except OSError as e:
+            logging.error(f"Metrics endpoint disabled, could not bind port {port}: {str(e)}")
+            metrics = None
+    try:
+        monitor.start_monitoring(interactive=False, watch_config=True)
+    finally:
+        if metrics is not None:
+            metrics.stop()
+        monitor.ocr.close()
+        if monitor.sender is not None:
+            monitor.sender.close()
+
+def soak_budgets(args, monitor):
+    budgets = dict(monitor.config.get("soak_budgets", {}))
+    for item in args.budget:
+        key, _, value = item.partition("=")
+        try:
+            budgets[key.strip()] = float(value)
+        except ValueError:
+            raise SystemExit(f"Invalid budget {item}, expected KEY=VALUE")
+    return budgets
+
+def run_soak_test(args, monitor):
+    area = monitor.config["message_area"]
+    source = SyntheticFrameSource(
+        width=area["width"],
+        height=area["height"],
+        keywords=monitor.config["keywords"],
+        frames=max(1, int(args.soak * 3600 * args.soak_rate)),
+        target_username=(monitor.target_usernames() or [None])[0],
+        seed=args.seed
+    )
+    print(f"Soaking {args.soak} simulated hours ({source.frames} scans)...")
+    report = run_soak(monitor, source, soak_budgets(args, monitor), simulated_tick=1.0 / args.soak_rate)
+    print_soak_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=4)
+    if not report["passed"]:
+        raise SystemExit(1)
+
+def run_headless(args, monitor):
+    if args.keywords is not None:
+        monitor.config["keywords"] = [k.strip() for k in args.keywords.split(",") if k.strip()]
+        monitor.compile_keywords()
+
+    if args.record:
+        record_frames(monitor, args.record, args.frames)
+        return
+
+    if args.soak:
+        run_soak_test(args, monitor)
+        return
+
+    if args.tune:
+        tune_ocr(monitor, args.tune, tolerance=args.tolerance)
+        return
+
+    if args.replay:
+        source = ReplayFrameSource(args.replay)
+        report = run_replay(monitor, source)
+    else:
+        area = monitor.config["message_area"]
+        source = SyntheticFrameSource(
+            width=area["width"],
+            height=area["height"],
+            keywords=monitor.config["keywords"],
+            frames=args.frames,
+            target_username=(monitor.target_usernames() or [None])[0],
+            seed=args.seed
+        )
+        report = run_replay(monitor, source)
+
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=4)
+
+def main():
+    args = parse_args()
+    headless = bool(args.record or args.replay or args.synthetic or args.tune or args.soak or args.daemon)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    
+    if args.stats:
+        show_stats(args)
+        return
+
+    try:
+        if os.name == 'nt':
+            tesseract_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+            import pytesseract
+
+            if os.path.exists(tesseract_path):
+                pytesseract.pytesseract.tesseract_cmd = tesseract_path
+            elif not headless:
+                print("Tesseract not found in default location!")
+                custom_path = input("Enter Tesseract path (or press Enter to try system PATH): ")
+                if custom_path:
+                    pytesseract.pytesseract.tesseract_cmd = custom_path
+
+        monitor = DiscordMonitor(config_path=args.config)
+
+        if args.daemon:
+            run_daemon(args, monitor)
+            return
+
+        if headless:
+            run_headless(args, monitor)
+            return
+
+        from .ui import run_menu
+        run_menu(monitor)
+
+    except Exception as e:
+        logging.critical(f"Critical error: {str(e)}")
+        if headless:
+            raise
+        print(f"\nAn error occurred: {str(e)}")
+        input("\nPress Enter to exit...")
+
+if __name__ == "__main__":
+
+    main()
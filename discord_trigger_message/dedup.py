@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .matching import normalize_ocr_text
+
+def message_fingerprint(*parts):
+    """Stable across rows, processes and light OCR noise, unlike hash(f"{line}_{index}")"""
+    normalized = "\n".join(normalize_ocr_text(part or "") for part in parts)
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=12).hexdigest()
+
+class DedupStore:
+    """Bounded LRU/TTL set of message fingerprints that can be persisted between runs.
+
+    A fingerprint stays known while it keeps being seen on screen and expires
+    ttl seconds after it was last seen; beyond max_entries the least recently
+    seen fingerprints are evicted (about 100 bytes each).
+    """
+
+    def __init__(self, max_entries=10000, ttl=300.0, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __contains__(self, fingerprint):
+        seen = self.entries.get(fingerprint)
+        return seen is not None and time.time() - seen <= self.ttl
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, fingerprint):
+        with self.lock:
+            self.entries[fingerprint] = time.time()
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    touch = add
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def prune(self):
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            while self.entries:
+                fingerprint, seen = next(iter(self.entries.items()))
+                if seen >= cutoff:
+                    break
+                self.entries.popitem(last=False)
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Could not load dedup store: {str(e)}")
+            return
+        with self.lock:
+            for fingerprint, seen in sorted(entries.items(), key=lambda item: item[1]):
+                self.entries[fingerprint] = seen
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.prune()
+
+    def save(self):
+        if not self.path:
+            return
+        self.prune()
+        with self.lock:
+            entries = dict(self.entries)
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "w") as f:
+                json.dump(entries, f)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            logging.warning(f"Could not save dedup store: {str(e)}")
+
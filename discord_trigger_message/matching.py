@@ -0,0 +1,211 @@
+import re
+
+OCR_CONFUSABLES = str.maketrans({
+    "0": "o",
+    "1": "l",
+    "i": "l",
+    "|": "l",
+    "!": "l",
+    "5": "s",
+    "$": "s",
+    "8": "b",
+    "@": "a"
+})
+OCR_CONFUSABLE_SEQUENCES = (("rn", "m"), ("vv", "w"), ("cl", "d"))
+
+def normalize_ocr_text(text):
+    text = text.lower()
+    for sequence, replacement in OCR_CONFUSABLE_SEQUENCES:
+        text = text.replace(sequence, replacement)
+    text = text.translate(OCR_CONFUSABLES)
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+def bounded_edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+class FuzzyKeywordIndex:
+    """Bigram-filtered index for matching keywords against noisy OCR tokens.
+
+    Keywords and text are folded through the OCR confusable table first, then
+    every window of whole tokens is compared with the keywords of the same
+    token count. One edit destroys at most two bigrams, so a keyword with D
+    distinct bigrams within k edits still shares D - 2k of them with the
+    window; only keywords passing that count are confirmed with a bounded
+    edit distance. Keywords shorter than four characters only match exactly
+    after normalization.
+    """
+
+    def __init__(self, keywords, max_distance=1, distances=None):
+        distances = distances or {}
+        self.exact = {}
+        self.buckets = {}
+
+        for keyword in keywords:
+            normalized = normalize_ocr_text(keyword)
+            if not normalized:
+                continue
+            limit = min(distances.get(keyword, max_distance), len(normalized) // 4)
+            size = len(normalized.split())
+            if not limit:
+                self.exact.setdefault((size, normalized), []).append(keyword)
+                continue
+
+            bucket = self.buckets.setdefault(size, {"grams": {}, "always": [], "lengths": set()})
+            bucket["lengths"].update(range(len(normalized) - limit, len(normalized) + limit + 1))
+            grams = bigrams(normalized)
+            entry = (keyword, normalized, limit, len(grams) - 2 * limit)
+            if entry[3] <= 0:
+                bucket["always"].append(entry)
+            for gram in grams:
+                bucket["grams"].setdefault(gram, []).append(entry)
+        self.window_sizes = sorted({size for size, _ in self.exact} | set(self.buckets))
+
+    def match(self, text):
+        hits = []
+        if not self.window_sizes:
+            return hits
+
+        tokens = normalize_ocr_text(text).split()
+        for size in self.window_sizes:
+            bucket = self.buckets.get(size)
+            for start in range(len(tokens) - size + 1):
+                window = " ".join(tokens[start:start + size])
+                for keyword in self.exact.get((size, window), ()):
+                    if keyword not in hits:
+                        hits.append(keyword)
+                if bucket is None or len(window) not in bucket["lengths"]:
+                    continue
+
+                counts = {}
+                grams = bucket["grams"]
+                for gram in bigrams(window):
+                    for entry in grams.get(gram, ()):
+                        counts[entry] = counts.get(entry, 0) + 1
+                candidates = [entry for entry, count in counts.items() if count >= entry[3]] + bucket["always"]
+                for keyword, normalized, limit, _ in candidates:
+                    if keyword in hits or abs(len(window) - len(normalized)) > limit:
+                        continue
+                    if bounded_edit_distance(window, normalized, limit) <= limit:
+                        hits.append(keyword)
+        return hits
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over all trigger keywords, plus optional regex triggers"""
+
+    def __init__(self, keywords, case_sensitive=False, whole_word=False, patterns=(), fuzzy=None):
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self.fuzzy = fuzzy
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+
+        for keyword in keywords:
+            if keyword:
+                self.add_keyword(keyword)
+        self.build_failure_links()
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self.patterns = [(pattern, re.compile(pattern, flags)) for pattern in patterns if pattern]
+
+    @classmethod
+    def from_config(cls, config, keywords=None, patterns=None):
+        if keywords is None:
+            keywords = config.get("keywords") or []
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        if patterns is None:
+            patterns = config.get("regex_keywords", [])
+
+        fuzzy = None
+        if config.get("fuzzy_matching", False):
+            fuzzy = FuzzyKeywordIndex(
+                keywords,
+                max_distance=config.get("fuzzy_max_distance", 1),
+                distances=config.get("fuzzy_distances", {})
+            )
+
+        return cls(
+            keywords,
+            case_sensitive=config.get("case_sensitive", False),
+            whole_word=config.get("whole_word", False),
+            patterns=patterns,
+            fuzzy=fuzzy
+        )
+
+    def add_keyword(self, keyword):
+        state = 0
+        for char in keyword if self.case_sensitive else keyword.lower():
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self.outputs[state].append((keyword, len(keyword)))
+
+    def build_failure_links(self):
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.transitions[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def is_word_boundary(self, text, start, end):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+    def match(self, text):
+        hits = []
+        search_text = text if self.case_sensitive else text.lower()
+        transitions = self.transitions
+        fail = self.fail
+        outputs = self.outputs
+        state = 0
+
+        for position, char in enumerate(search_text):
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            for keyword, length in outputs[state]:
+                if keyword in hits:
+                    continue
+                if self.whole_word and not self.is_word_boundary(search_text, position - length + 1, position + 1):
+                    continue
+                hits.append(keyword)
+
+        if self.fuzzy is not None:
+            for keyword in self.fuzzy.match(text):
+                if keyword not in hits:
+                    hits.append(keyword)
+
+        for pattern, compiled in self.patterns:
+            if pattern not in hits and compiled.search(text):
+                hits.append(pattern)
+        return hits
+
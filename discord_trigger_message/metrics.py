@@ -0,0 +1,48 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in ("/", "/metrics"):
+            body = self.server.monitor.metrics()
+        elif self.path == "/health":
+            body = {"running": self.server.monitor.running}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+    """Serves the monitor's counters and stage latencies as JSON on a local port"""
+
+    def __init__(self, monitor, host="127.0.0.1", port=9108):
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.monitor = monitor
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True)
+        self.thread.start()
+        logging.info(f"Metrics available at http://{self.address[0]}:{self.address[1]}/metrics")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
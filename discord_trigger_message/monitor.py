@@ -0,0 +1,609 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .capture import ScreenFrameSource, FrameChangeGate
+from .dedup import DedupStore, message_fingerprint
+from .ocr import BandOCR, create_ocr_backend, group_words, attribute_lines
+from .pipeline import MonitorPipeline
+from .preprocess import prepare_for_ocr
+from .regions import MonitorRegion, ocr_settings, target_usernames, is_target_author
+from .scheduler import ScanScheduler
+from .sender import DiscordSender
+from .sessionlog import SessionLog
+from .timing import StageTimings
+
+def load_keyboard():
+    try:
+        import keyboard
+        return keyboard
+    except Exception:
+        # No input access, e.g. headless or unprivileged runs
+        return None
+
+REQUIRED_CONFIG_KEYS = {"keywords", "response", "scan_interval", "message_area", 
+                        "username_area", "case_sensitive", "discord_token", "channel_id", 
+                        "ocr_resolution", "ocr_config", "target_username"}
+
+class DiscordMonitor:
+    def __init__(self, config_path='monitor_config.json'):
+        self.config_path = config_path
+        self.config_mtime = None
+        self.config_reloads = 0
+        self.load_config()
+        self.running = False
+        self.stop_event = threading.Event()
+        self.scheduler = ScanScheduler.from_config(self.config)
+        self.messages_detected = 0
+        self.messages_sent = 0
+        self.processed_messages = DedupStore(
+            max_entries=self.config.get("dedup_max_entries", 10000),
+            ttl=self.config.get("dedup_ttl", 300.0),
+            path=self.dedup_path() if self.config.get("dedup_persist", False) else None
+        )
+        self.session_log = SessionLog.from_config(self.config)
+        self.migrate_session_history()
+        self.initial_scan = True
+        self.start_time = None
+        self.session_data = {
+            "start_time": None,
+            "end_time": None,
+            "messages_detected": 0,
+            "messages_sent": 0
+        }
+        self.frames_skipped = 0
+        self.frames_processed = 0
+        self.pixels_recognized = 0
+        self.frame_gate = FrameChangeGate(
+            threshold=self.config.get("change_threshold", 12),
+            downsample=self.config.get("change_downsample", 4)
+        )
+        self.ocr = create_ocr_backend(self.config)
+        self.timings = StageTimings(window=self.config.get("timing_window", 1000))
+        self.band_ocr = BandOCR(self.ocr, cache_size=self.config.get("band_cache_size", 512), timings=self.timings)
+        self.pipeline = None
+        self.sender = None
+        self.frame_source = ScreenFrameSource(backend=self.config.get("capture_backend", "auto"))
+        self.last_trigger = None
+
+    def save_config(self):
+        """Save the current configuration to the config file"""
+        try:
+            with open(self.config_path, 'w') as f:
+                json.dump(self.config, f, indent=4)
+            self.config_mtime = self.read_config_mtime()
+            logging.info("Configuration saved successfully")
+        except Exception as e:
+            logging.error(f"Error saving configuration: {str(e)}")
+            raise
+
+    def load_config(self):
+        try:
+            with open(self.config_path, 'r') as f:
+                loaded_config = json.load(f)
+            if not all(key in loaded_config for key in REQUIRED_CONFIG_KEYS):
+                logging.info("Old config format detected, creating fresh config")
+                self.create_new_config()
+            else:
+                self.config = loaded_config
+                self.config_mtime = self.read_config_mtime()
+        except FileNotFoundError:
+            logging.info("Config file not found, creating new config")
+            self.create_new_config()
+        except json.JSONDecodeError:
+            logging.error("Invalid config file, creating new config")
+            self.create_new_config()
+        self.compile_keywords()
+
+    def dedup_path(self):
+        """Where the persisted dedup store lives, next to the config file unless dedup_path is set"""
+        return self.config.get("dedup_path") or os.path.join(os.path.dirname(os.path.abspath(self.config_path)), "dedup_store.json")
+
+    def migrate_session_history(self):
+        """Move the session_history list older configs kept inline into the session log"""
+        history = self.config.pop("session_history", None)
+        if history is None:
+            return
+        self.session_log.write([
+            {"t": session.get("end_time"), "type": "session_end", "session": session, "migrated": True}
+            for session in history
+        ])
+        self.save_config()
+        if history:
+            logging.info(f"Moved {len(history)} session(s) from the config to {self.session_log.path}")
+
+    def compile_keywords(self):
+        self.regions = MonitorRegion.from_config(self.config)
+
+    @property
+    def has_responded(self):
+        return all(region.has_responded for region in self.regions)
+
+    def reset_regions(self):
+        for region in self.regions:
+            region.reset()
+
+    def rearm_regions(self):
+        for region in self.regions:
+            region.rearm()
+
+    def trigger_rules(self):
+        return [rule for region in self.regions for rule in region.rules.rules]
+
+    def read_config_mtime(self):
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_config(self):
+        """Apply an edited config file to the running monitor, keeping the current config if the new one is invalid"""
+        try:
+            with open(self.config_path, 'r') as f:
+                loaded_config = json.load(f)
+            missing = REQUIRED_CONFIG_KEYS - set(loaded_config)
+            if missing:
+                raise ValueError(f"missing keys: {', '.join(sorted(missing))}")
+            regions = MonitorRegion.from_config(loaded_config)
+        except Exception as e:
+            logging.error(f"Error reloading configuration, keeping the current one: {str(e)}")
+            return False
+
+        previous = {region.name: region for region in self.regions}
+        for region in regions:
+            if region.name in previous:
+                region.carry_state(previous[region.name])
+
+        self.config = loaded_config
+        self.regions = regions
+        self.frame_gate = FrameChangeGate(
+            threshold=self.config.get("change_threshold", 12),
+            downsample=self.config.get("change_downsample", 4)
+        )
+        self.scheduler = ScanScheduler.from_config(self.config)
+        self.config_reloads += 1
+        logging.info(f"Configuration reloaded from {self.config_path} "
+                     f"({len(regions)} region(s), {len(self.trigger_rules())} rule(s))")
+        return True
+
+    def reload_config_if_changed(self):
+        mtime = self.read_config_mtime()
+        if mtime is None or mtime == self.config_mtime:
+            return False
+        self.config_mtime = mtime
+        return self.reload_config()
+
+    def ocr_pixels(self):
+        """Pixels sent to the OCR engine for message areas, whole frames and text rows together"""
+        return self.pixels_recognized + self.band_ocr.pixels_recognized
+
+    def metrics(self):
+        uptime = (datetime.now() - self.start_time).total_seconds() if self.running and self.start_time else 0.0
+        return {
+            "running": self.running,
+            "uptime_seconds": round(uptime, 1),
+            "messages_detected": self.messages_detected,
+            "messages_sent": self.messages_sent,
+            "frames_processed": self.frames_processed,
+            "frames_skipped": self.frames_skipped,
+            "frames_dropped": self.pipeline.frames_dropped if self.pipeline else 0,
+            "has_responded": self.has_responded,
+            "config_reloads": self.config_reloads,
+            "ocr_pixels": self.ocr_pixels(),
+            "ocr_rows_recognized": self.band_ocr.bands_recognized,
+            "ocr_rows_reused": self.band_ocr.bands_reused,
+            "regions": {
+                region.name: {"triggers": region.triggers, "has_responded": region.has_responded}
+                for region in self.regions
+            },
+            "scan": self.scheduler.stats(),
+            "latency": self.timings.summary()
+        }
+
+    def create_new_config(self):
+        self.config = {
+            "keywords": "",
+            "response": "",
+            "scan_interval": 0.01,
+            "message_area": {
+                "top": 865,
+                "left": 312,
+                "width": 1365,
+                "height": 177
+            },
+            "username_area": {
+                "top": 865,
+                "left": 100,
+                "width": 200,
+                "height": 30
+            },
+            "case_sensitive": False,
+            "discord_token": "",
+            "channel_id": "",
+            "ocr_resolution": 1.0,
+            "ocr_config": "--psm 4",
+            "ocr_resample": "bilinear",
+            "ocr_binarize": "otsu",
+            "ocr_invert": "auto",
+            "target_username": "",
+            "target_usernames": [],
+            "username_mode": "layout",
+            "whole_word": False,
+            "regex_keywords": [],
+            "rules": [],
+            "regions": [],
+            "dedup_ttl": 300.0,
+            "dedup_max_entries": 10000,
+            "dedup_persist": False,
+            "dedup_path": "",
+            "dedup_save_interval": 30.0,
+            "fuzzy_matching": False,
+            "fuzzy_max_distance": 1,
+            "fuzzy_distances": {},
+            "detection_engine": "ocr",
+            "template_threshold": 0.75,
+            "template_font": "",
+            "template_font_size": 16,
+            "keyword_templates": {},
+            "change_threshold": 12,
+            "change_downsample": 4,
+            "ocr_backend": "auto",
+            "capture_backend": "auto",
+            "band_ocr": True,
+            "band_cache_size": 512,
+            "pipeline": True,
+            "ocr_workers": 1,
+            "ocr_pool": "thread",
+            "scan_interval_max": 0.5,
+            "scan_backoff": 1.5,
+            "adaptive_rate": True,
+            "cpu_budget": 0.5,
+            "status_hz": 4,
+            "session_log": "session_log.jsonl",
+            "session_log_max_bytes": 5242880,
+            "session_log_backups": 5,
+            "config_reload_interval": 1.0,
+            "metrics_port": 9108
+        }
+        self.save_config()
+        logging.info("Created fresh config file")
+
+    def get_sender(self):
+        token = self.config.get("discord_token")
+        if self.sender is None or self.sender.token != token:
+            if self.sender is not None:
+                self.sender.close()
+            self.sender = DiscordSender(token, max_retries=self.config.get("send_max_retries", 3))
+        return self.sender
+
+    def send_discord_message(self, message, detected_at=None, channel_id=None):
+        channel_id = channel_id or self.config.get("channel_id")
+        if not self.config.get("discord_token") or not channel_id:
+            logging.error("Token or channel ID not configured")
+            return False
+        
+        try:
+            with self.timings.measure("send"):
+                self.get_sender().send(channel_id, message, detected_at=detected_at)
+            if detected_at is not None:
+                self.timings.record("end_to_end", (time.perf_counter() - detected_at) * 1000)
+            self.messages_sent += 1
+            self.session_data["messages_sent"] += 1
+            self.session_log.log("send", channel_id=channel_id, ok=True)
+            logging.info("Message sent successfully")
+            return True
+        except Exception as e:
+            self.session_log.log("send", channel_id=channel_id, ok=False, error=str(e))
+            logging.error(f"Failed to send message: {str(e)}")
+            return False
+
+    def ocr_settings(self):
+        return ocr_settings(self.config)
+
+    def target_usernames(self):
+        return target_usernames(self.config)
+
+    def is_target_author(self, author):
+        return is_target_author(self.config, author)
+
+    def check_username(self, screenshot, region=None):
+        region = region or self.regions[0]
+        try:
+            with self.timings.measure("resize"):
+                screenshot = prepare_for_ocr(screenshot, **region.ocr_settings())
+
+            with self.timings.measure("ocr_username"):
+                text = self.ocr.image_to_string(screenshot, config=region.config["ocr_config"])
+            return region.is_target_author(text.strip())
+        except Exception as e:
+            logging.error(f"Error checking username: {str(e)}")
+            return False
+
+    def read_message_lines(self, screenshot, region=None):
+        region = region or self.regions[0]
+        if region.templates is not None:
+            with self.timings.measure("template"):
+                candidates = region.templates.candidates(screenshot)
+            if not candidates:
+                return None
+
+        config = region.config
+        if config.get("band_ocr", True):
+            return self.band_ocr.recognize(screenshot, config["ocr_config"], ocr_settings(config))
+
+        with self.timings.measure("resize"):
+            screenshot = prepare_for_ocr(screenshot, **ocr_settings(config))
+        self.pixels_recognized += screenshot.width * screenshot.height
+
+        with self.timings.measure("ocr_message"):
+            return group_words(self.ocr.image_to_data(screenshot, config=config["ocr_config"]))
+
+    def reset_dedup(self):
+        if self.processed_messages.path:
+            self.processed_messages.load()
+        else:
+            self.processed_messages.clear()
+
+    def consume_initial_scan(self):
+        if not self.initial_scan:
+            return False
+        self.initial_scan = False
+        self.reset_dedup()
+        self.reset_regions()
+        self.frame_gate.reset()
+        time.sleep(2)
+        return True
+
+    def capture_areas(self, regions=None):
+        areas = {}
+        for region in self.regions if regions is None else regions:
+            areas.update(region.capture_areas())
+        return areas
+
+    def capture_frame(self):
+        """Grab all active regions in one pass and return a job for each region whose pixels changed"""
+        regions = [region for region in self.regions if not region.has_responded]
+        for region in regions:
+            # Skipped or template-only ticks do not OCR, so keep what is still on screen from expiring
+            for fingerprint in region.visible:
+                self.processed_messages.touch(fingerprint)
+        captured_at = time.perf_counter()
+        with self.timings.measure("grab"):
+            images = self.frame_source.capture(self.capture_areas(regions))
+
+        jobs = []
+        for region in regions:
+            changed = False
+            for name in region.capture_areas():
+                if name in images:
+                    changed = self.frame_gate.has_changed(name, images[name]) or changed
+            if changed:
+                jobs.append({
+                    "region": region,
+                    "message": images[region.prefix + "message"],
+                    "username": images.get(region.prefix + "username"),
+                    "captured_at": captured_at
+                })
+
+        if not jobs:
+            self.frames_skipped += 1
+            return None
+        self.frames_processed += 1
+        return jobs
+
+    def recognize_frame(self, frame):
+        region = frame["region"]
+        if frame["username"] is not None and not self.check_username(frame["username"], region):
+            return None
+        lines = self.read_message_lines(frame["message"], region)
+        if lines is None:
+            return None
+        if frame["username"] is not None or not region.target_usernames():
+            return [(None, line["text"]) for line in lines]
+        return attribute_lines(lines)
+
+    def process_lines(self, lines, dispatch=None, detected_at=None, region=None):
+        region = region or self.regions[0]
+        triggered = False
+        visible = set()
+        filter_authors = region.config.get("username_mode", "area") != "area" and region.target_usernames()
+
+        for author, line in lines:
+            if filter_authors and not region.is_target_author(author):
+                continue
+
+            with self.timings.measure("match"):
+                matches = region.rules.match(line)
+
+            for rule, hits in matches:
+                fingerprint = message_fingerprint(region.prefix + rule.name, author, line)
+                visible.add(fingerprint)
+                if fingerprint in self.processed_messages:
+                    self.processed_messages.touch(fingerprint)
+                    continue
+                self.processed_messages.add(fingerprint)
+
+                now = time.monotonic()
+                if rule.armed(now):
+                    rule.fire(now)
+                    region.triggers += 1
+                    self.messages_detected += 1
+                    self.session_data["messages_detected"] += 1
+                    self.last_trigger = {"line": line, "author": author, "region": region.name, "rule": rule.name, "keywords": hits}
+                    self.session_log.log("trigger", **self.last_trigger)
+                    logging.info(f"Rule '{region.prefix}{rule.name}': keyword(s) {', '.join(repr(hit) for hit in hits)} found in: {line}"
+                                 + (f" (from {author})" if author else ""))
+                    (dispatch or self.send_discord_message)(rule.response, detected_at, rule.channel_id)
+                    triggered = True
+
+        region.visible = visible
+        region.has_responded = region.rules.exhausted
+        return triggered
+
+    def check_for_message(self, dispatch=None):
+        try:
+            if self.consume_initial_scan():
+                return False
+
+            if self.has_responded:
+                return False
+
+            jobs = self.capture_frame()
+            if jobs is None:
+                return False
+
+            triggered = False
+            for job in jobs:
+                lines = self.recognize_frame(job)
+                if lines is not None:
+                    triggered = self.process_lines(lines, dispatch=dispatch, detected_at=job["captured_at"], region=job["region"]) or triggered
+            return triggered
+
+        except Exception as e:
+            logging.error(f"Error checking message: {str(e)}")
+            return False
+
+    def calibrate_message_area(self):
+        from .ui import calibrate_message_area
+        return calibrate_message_area(self)
+
+    def calibrate_username_area(self):
+        from .ui import calibrate_username_area
+        return calibrate_username_area(self)
+
+    def edit_config(self):
+        from .ui import edit_config
+        return edit_config(self)
+
+    def edit_rules(self):
+        from .ui import edit_rules
+        return edit_rules(self)
+
+    def optimize_ocr(self):
+        from .ui import optimize_ocr
+        return optimize_ocr(self)
+
+    def view_ocr_area(self):
+        from .ui import view_ocr_area
+        return view_ocr_area(self)
+
+    def start_monitoring(self, interactive=True, watch_config=False):
+        # Cleared before the blocking warm-up so a stop requested meanwhile is not lost
+        self.stop_event.clear()
+        self.running = True
+        self.initial_scan = True
+        self.reset_dedup()
+        self.reset_regions()
+        self.frames_skipped = 0
+        self.frames_processed = 0
+        self.frame_gate.reset()
+        self.timings.reset()
+        self.start_time = datetime.now()
+        self.session_data = {
+            "start_time": self.start_time.isoformat(timespec="seconds"),
+            "end_time": None,
+            "messages_detected": 0,
+            "messages_sent": 0
+        }
+        self.session_log.start()
+        self.session_log.log("session_start", regions=[region.name for region in self.regions],
+                             rules=len(self.trigger_rules()))
+        say = print if interactive else logging.info
+        say("Starting message monitor...")
+        for region in self.regions:
+            for rule in region.rules.rules:
+                say(f"Rule '{region.prefix}{rule.name}': looking for {', '.join(rule.keywords + rule.patterns)}")
+                say(f"  Will respond in channel {rule.channel_id} with: {rule.response}")
+        if self.target_usernames():
+            say(f"Monitoring messages from usernames: {', '.join(self.target_usernames())}")
+        if interactive:
+            print("\nPress ESC (or Ctrl+C) to stop monitoring")
+
+        sender = self.get_sender()
+        for rule in self.trigger_rules():
+            if rule.channel_id:
+                sender.prepare(rule.channel_id, rule.response)
+        sender.warm()
+
+        self.scheduler = ScanScheduler.from_config(self.config)
+        keyboard = load_keyboard() if interactive else None
+        hotkey = None
+        if keyboard is not None:
+            try:
+                hotkey = keyboard.add_hotkey('esc', self.stop_event.set)
+            except Exception as e:
+                # Importing keyboard can succeed where hooking it fails: non-root Linux, no input device
+                logging.warning(f"ESC hotkey unavailable, press Ctrl+C to stop: {str(e)}")
+
+        if self.config.get("pipeline", True):
+            self.pipeline = MonitorPipeline(
+                self,
+                workers=self.config.get("ocr_workers", 1),
+                send_workers=self.config.get("send_workers", 4)
+            )
+            self.pipeline.start()
+
+        started = time.monotonic()
+        status_period = 1 / self.config.get("status_hz", 4)
+        next_status = started
+        reload_period = self.config.get("config_reload_interval", 1.0)
+        next_reload = started + reload_period
+        save_period = self.config.get("dedup_save_interval", 30.0)
+        next_save = started + save_period
+
+        try:
+            while not self.stop_event.is_set():
+                if watch_config and time.monotonic() >= next_reload:
+                    self.reload_config_if_changed()
+                    next_reload = time.monotonic() + reload_period
+
+                if self.processed_messages.path and time.monotonic() >= next_save:
+                    # Checkpoint so a crash does not lose what was already answered
+                    self.processed_messages.save()
+                    next_save = time.monotonic() + save_period
+
+                if time.monotonic() >= next_status:
+                    if interactive:
+                        runtime = timedelta(seconds=int(time.monotonic() - started))
+                        dropped = f" | Frames Dropped: {self.pipeline.frames_dropped}" if self.pipeline else ""
+                        print(f"\rRuntime: {runtime} | Messages Detected: {self.messages_detected} | Messages Sent: {self.messages_sent} | Frames OCR'd: {self.frames_processed} | Frames Skipped: {self.frames_skipped}{dropped}{self.scheduler.format_status()}{self.timings.format_status()}", end="")
+                    next_status = time.monotonic() + status_period
+
+                if not self.pipeline and self.scheduler.due():
+                    processed = self.frames_processed
+                    self.check_for_message()
+                    self.scheduler.completed(self.frames_processed != processed)
+
+                timeout = (min(next_status, next_reload) if watch_config else next_status) - time.monotonic()
+                if not self.pipeline:
+                    timeout = min(timeout, self.scheduler.time_until_due())
+                self.stop_event.wait(max(0.0, timeout))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if hotkey is not None:
+                keyboard.remove_hotkey(hotkey)
+        self.stop_monitoring(interactive)
+
+    def stop_monitoring(self, interactive=True):
+        self.running = False
+        self.stop_event.set()
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+        self.processed_messages.save()
+
+        self.session_data["end_time"] = datetime.now().isoformat(timespec="seconds")
+        self.session_data["frames_processed"] = self.frames_processed
+        self.session_data["frames_skipped"] = self.frames_skipped
+        self.session_data["latency"] = self.timings.summary()
+        self.session_log.log("session_end", session=self.session_data)
+        self.session_log.close()
+        if interactive:
+            print("\nMonitoring stopped")
+        else:
+            logging.info("Monitoring stopped")
+
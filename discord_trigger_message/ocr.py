@@ -0,0 +1,370 @@
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pytesseract
+import numpy as np
+from PIL import Image
+
+from .preprocess import prepare_for_ocr
+from .timing import StageTimings
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+MESSAGE_HEADER = re.compile(
+    r"^(?P<name>\S+(?: \S+){0,2}?)\s*[-\u2014]?\s+"
+    r"(?:(?:Today|Yesterday) at |\d{1,2}/\d{1,2}/\d{2,4},?\s+(?:at\s+)?)"
+    r"\d{1,2}[:.]\d{2}(?:\s*[AaPp]\.?[Mm]\.?)?$"
+)
+# Discord draws timestamps at 12px next to 16px names and message text
+STAMP_WIDTH_RATIO = 0.85
+
+SINGLE_LINE_PSMS = {7, 8, 10, 13}
+
+def group_words(words):
+    """Group OCR word boxes into text lines by vertical overlap, top to bottom, keeping each line's boxes"""
+    lines = []
+    for word in sorted(words, key=lambda word: (word["top"], word["left"])):
+        centre = word["top"] + word["height"] / 2
+        for line in lines:
+            if line["top"] <= centre <= line["bottom"]:
+                line["words"].append(word)
+                line["top"] = min(line["top"], word["top"])
+                line["bottom"] = max(line["bottom"], word["top"] + word["height"])
+                break
+        else:
+            lines.append({"top": word["top"], "bottom": word["top"] + word["height"], "words": [word]})
+
+    lines.sort(key=lambda line: line["top"])
+    grouped = []
+    for line in lines:
+        line_words = sorted(line["words"], key=lambda word: word["left"])
+        grouped.append({"text": " ".join(word["text"] for word in line_words), "words": line_words})
+    return grouped
+
+def line_text(line):
+    return line if isinstance(line, str) else line["text"]
+
+def char_width(words):
+    characters = sum(len(word["text"]) for word in words)
+    return sum(word["width"] for word in words) / characters if characters else None
+
+def header_name(text):
+    header = MESSAGE_HEADER.match(text.strip())
+    if not header:
+        return None
+    name = header.group("name")
+    if len(name) > 32 or name.endswith((",", ".", "!", "?", ":")):
+        return None
+    return name
+
+def attribute_lines(lines):
+    """Pair each line with the author of the nearest message header at or above it.
+
+    Discord starts every message group with a header line holding the author
+    name (at most 32 characters) followed by "Today at", "Yesterday at" or a
+    date, and a time. Lines from group_words also carry word boxes; for those
+    the timestamp must be drawn in the smaller timestamp font, measured as
+    average character width against the other lines, so body text typed in
+    the same shape keeps its author. Header lines are still returned so their
+    text is matched too; lines before the first visible header have no known
+    author.
+    """
+    names = [header_name(line_text(line)) for line in lines]
+    reference = char_width([
+        word for line, name in zip(lines, names) if name is None and not isinstance(line, str) for word in line["words"]
+    ])
+
+    messages = []
+    author = None
+    for line, name in zip(lines, names):
+        if name is not None and not isinstance(line, str):
+            size = len(name.split())
+            stamp = char_width([word for word in line["words"][size:] if word["text"] not in ("-", "\u2014")])
+            base = reference or char_width(line["words"][:size])
+            if stamp is None or base is None or stamp >= STAMP_WIDTH_RATIO * base:
+                name = None
+        if name is not None:
+            author = name
+        messages.append((author, line_text(line)))
+    return messages
+
+class BandOCR:
+    """Splits the message area into text rows and only OCRs rows it has not seen before.
+
+    Rows are cached and returned as group_words lines, with their word boxes.
+    """
+
+    def __init__(self, ocr, cache_size=512, ink_threshold=40, merge_gap=2, padding=3, timings=None):
+        self.ocr = ocr
+        self.timings = timings or StageTimings()
+        self.cache_size = cache_size
+        self.ink_threshold = ink_threshold
+        self.merge_gap = merge_gap
+        self.padding = padding
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.pixels_recognized = 0
+        self.bands_recognized = 0
+        self.bands_reused = 0
+
+    def find_bands(self, gray):
+        pixels = np.asarray(gray)
+        background = np.argmax(np.bincount(pixels.ravel(), minlength=256))
+        mask = np.abs(pixels.astype(np.int16) - background) > self.ink_threshold
+        ink = mask.any(axis=1)
+
+        bands = []
+        start = None
+        gap = 0
+        for row, has_ink in enumerate(ink):
+            if has_ink:
+                if start is None:
+                    start = row
+                gap = 0
+            elif start is not None:
+                gap += 1
+                if gap > self.merge_gap:
+                    bands.append((start, row - gap + 1))
+                    start = None
+                    gap = 0
+        if start is not None:
+            bands.append((start, len(ink) - gap))
+        return pixels, mask, bands
+
+    def recognize(self, screenshot, ocr_config, settings):
+        pixels, mask, bands = self.find_bands(screenshot.convert("L"))
+        height, width = pixels.shape
+        results = []
+        missing = []
+
+        for top, bottom in bands:
+            top = max(0, top - self.padding)
+            bottom = min(height, bottom + self.padding)
+            key = (
+                hashlib.blake2b(pixels[top:bottom].tobytes(), digest_size=16).digest(),
+                ocr_config,
+                tuple(sorted(settings.items()))
+            )
+
+            with self.lock:
+                band_lines = self.cache.get(key)
+                if band_lines is not None:
+                    self.cache.move_to_end(key)
+                    self.bands_reused += 1
+
+            if band_lines is None:
+                columns = np.flatnonzero(mask[top:bottom].any(axis=0))
+                left = max(0, columns[0] - self.padding)
+                right = min(width, columns[-1] + 1 + self.padding)
+                crop = screenshot.crop((left, top, right, bottom))
+                with self.timings.measure("resize"):
+                    crop = np.array(prepare_for_ocr(crop, **settings))
+                missing.append((len(results), key, crop))
+            results.append(band_lines)
+
+        if missing:
+            recognized = self.recognize_crops([crop for _, _, crop in missing], ocr_config)
+            with self.lock:
+                for (index, key, crop), band_lines in zip(missing, recognized):
+                    results[index] = band_lines
+                    self.pixels_recognized += crop.size
+                    self.bands_recognized += 1
+                    self.cache[key] = band_lines
+                    if len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+
+        return [line for band_lines in results for line in band_lines]
+
+    def recognize_crops(self, crops, ocr_config):
+        """OCR new bands in one engine call by stacking them, so pytesseract starts one process per frame"""
+        if len(crops) == 1 or parse_ocr_config(ocr_config)["psm"] in SINGLE_LINE_PSMS:
+            with self.timings.measure("ocr_message"):
+                return [group_words(self.ocr.image_to_data(Image.fromarray(crop), config=ocr_config)) for crop in crops]
+
+        gap = max(8, max(crop.shape[0] for crop in crops) // 2)
+        width = max(crop.shape[1] for crop in crops)
+        blocks = []
+        spans = []
+        offset = 0
+        for crop in crops:
+            block = np.full((crop.shape[0] + gap, width), crop[0, 0], dtype=np.uint8)
+            block[gap:, :crop.shape[1]] = crop
+            spans.append((offset + gap, offset + gap + crop.shape[0]))
+            offset += block.shape[0]
+            blocks.append(block)
+
+        with self.timings.measure("ocr_message"):
+            words = self.ocr.image_to_data(Image.fromarray(np.vstack(blocks)), config=ocr_config)
+
+        band_words = [[] for _ in crops]
+        for word in words:
+            centre = word["top"] + word["height"] / 2
+            for index, (start, end) in enumerate(spans):
+                if centre < end + gap / 2 or index == len(spans) - 1:
+                    band_words[index].append(dict(word, top=word["top"] - start))
+                    break
+        return [group_words(words) for words in band_words]
+
+def parse_ocr_config(ocr_config):
+    options = {"psm": 3, "oem": 3, "variables": {}}
+    parts = ocr_config.split()
+    for i, part in enumerate(parts[:-1]):
+        if part == "--psm":
+            options["psm"] = int(parts[i + 1])
+        elif part == "--oem":
+            options["oem"] = int(parts[i + 1])
+        elif part == "-c" and "=" in parts[i + 1]:
+            key, value = parts[i + 1].split("=", 1)
+            options["variables"][key] = value
+    return options
+
+class PytesseractBackend:
+    """Fallback backend that runs the tesseract executable for every call"""
+
+    name = "pytesseract"
+
+    def image_to_string(self, image, config=""):
+        return pytesseract.image_to_string(image, config=config)
+
+    def image_to_data(self, image, config=""):
+        data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+        words = []
+        for i, text in enumerate(data["text"]):
+            if text.strip():
+                words.append({
+                    "text": text.strip(),
+                    "left": data["left"][i],
+                    "top": data["top"][i],
+                    "width": data["width"][i],
+                    "height": data["height"][i],
+                    "conf": float(data["conf"][i])
+                })
+        return words
+
+    def close(self):
+        pass
+
+class TesserocrBackend:
+    """Keeps libtesseract loaded and feeds it in-memory images"""
+
+    name = "tesserocr"
+
+    def __init__(self, lang="eng", tessdata_path=None):
+        self.lang = lang
+        self.tessdata_path = tessdata_path
+        self.local = threading.local()
+        self.handles = []
+        self.lock = threading.Lock()
+
+    def get_api(self, config):
+        apis = getattr(self.local, "apis", None)
+        if apis is None:
+            apis = self.local.apis = {}
+
+        api = apis.get(config)
+        if api is None:
+            options = parse_ocr_config(config)
+            kwargs = {"lang": self.lang, "psm": options["psm"], "oem": options["oem"]}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            for key, value in options["variables"].items():
+                api.SetVariable(key, value)
+            apis[config] = api
+            with self.lock:
+                self.handles.append(api)
+        return api
+
+    def image_to_string(self, image, config=""):
+        api = self.get_api(config)
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+    def image_to_data(self, image, config=""):
+        api = self.get_api(config)
+        api.SetImage(image)
+        api.Recognize()
+        words = []
+        level = tesserocr.RIL.WORD
+        for result in tesserocr.iterate_level(api.GetIterator(), level):
+            text = result.GetUTF8Text(level)
+            box = result.BoundingBox(level)
+            if text and text.strip() and box:
+                words.append({
+                    "text": text.strip(),
+                    "left": box[0],
+                    "top": box[1],
+                    "width": box[2] - box[0],
+                    "height": box[3] - box[1],
+                    "conf": result.Confidence(level)
+                })
+        return words
+
+    def close(self):
+        with self.lock:
+            for api in self.handles:
+                api.End()
+            self.handles.clear()
+        self.local = threading.local()
+
+process_ocr_backend = None
+
+def process_ocr(image, config, settings, method="image_to_string"):
+    global process_ocr_backend
+    if process_ocr_backend is None:
+        if settings.get("tesseract_cmd"):
+            pytesseract.pytesseract.tesseract_cmd = settings["tesseract_cmd"]
+        process_ocr_backend = create_ocr_backend(dict(settings, ocr_pool="thread"))
+    return getattr(process_ocr_backend, method)(image, config=config)
+
+class ProcessOCRBackend:
+    """Runs OCR calls in worker processes so recognition is not bound by the GIL"""
+
+    name = "process"
+
+    def __init__(self, config, workers=1):
+        self.settings = {
+            "ocr_backend": config.get("ocr_backend", "auto"),
+            "ocr_lang": config.get("ocr_lang", "eng"),
+            "tessdata_path": config.get("tessdata_path"),
+            "ocr_config": config.get("ocr_config", ""),
+            "tesseract_cmd": pytesseract.pytesseract.tesseract_cmd
+        }
+        self.pool = ProcessPoolExecutor(max_workers=max(1, workers))
+
+    def image_to_string(self, image, config=""):
+        return self.pool.submit(process_ocr, image, config, self.settings).result()
+
+    def image_to_data(self, image, config=""):
+        return self.pool.submit(process_ocr, image, config, self.settings, "image_to_data").result()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+def create_ocr_backend(config):
+    if config.get("ocr_pool", "thread") == "process":
+        return ProcessOCRBackend(config, workers=config.get("ocr_workers", 1))
+
+    backend = config.get("ocr_backend", "auto")
+    if backend in ("auto", "tesserocr"):
+        if tesserocr is None:
+            if backend == "tesserocr":
+                logging.warning("tesserocr is not installed, falling back to pytesseract")
+        else:
+            try:
+                ocr = TesserocrBackend(
+                    lang=config.get("ocr_lang", "eng"),
+                    tessdata_path=config.get("tessdata_path") or None
+                )
+                ocr.get_api(config.get("ocr_config", ""))
+                return ocr
+            except Exception as e:
+                logging.warning(f"Could not start tesserocr, falling back to pytesseract: {str(e)}")
+    return PytesseractBackend()
+
@@ -0,0 +1,100 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class MonitorPipeline:
+    """Runs capture, OCR and sending as separate stages so a slow stage never stalls capture.
+
+    Capture runs on its own thread and splits each frame into one job per
+    changed region. Jobs share a bounded OCR pool with fair queuing: a region
+    has at most one job running and keeps only its newest job waiting (older
+    ones are dropped), and free workers take waiting regions round-robin so a
+    busy region cannot starve the others. Sends go through their own executor.
+    """
+
+    def __init__(self, monitor, workers=1, send_workers=4):
+        self.monitor = monitor
+        self.workers = max(1, workers)
+        self.ocr_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+        self.send_pool = ThreadPoolExecutor(max_workers=max(1, send_workers), thread_name_prefix="send")
+        self.lock = threading.Lock()
+        self.match_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.capture_thread = None
+        self.in_flight = 0
+        self.pending = OrderedDict()
+        self.active = set()
+        self.frames_dropped = 0
+
+    def start(self):
+        self.stop_event.clear()
+        self.capture_thread = threading.Thread(target=self.capture_loop, name="capture", daemon=True)
+        self.capture_thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.capture_thread is not None:
+            self.capture_thread.join()
+        self.ocr_pool.shutdown(wait=True)
+        self.send_pool.shutdown(wait=True)
+
+    def capture_loop(self):
+        monitor = self.monitor
+        while monitor.scheduler.wait(self.stop_event):
+            jobs = None
+            try:
+                if not monitor.consume_initial_scan() and not monitor.has_responded:
+                    jobs = monitor.capture_frame()
+                    for job in jobs or ():
+                        self.submit(job)
+            except Exception as e:
+                logging.error(f"Error capturing frame: {str(e)}")
+            monitor.scheduler.completed(bool(jobs))
+
+    def submit(self, job):
+        with self.lock:
+            name = job["region"].name
+            if name in self.pending:
+                self.frames_dropped += 1
+            self.pending[name] = job
+            while self.in_flight < self.workers:
+                job = self.next_job()
+                if job is None:
+                    break
+                self.in_flight += 1
+                self.ocr_pool.submit(self.recognize, job)
+
+    def next_job(self):
+        # Regions stay in arrival order; a region that is already being
+        # recognized keeps its place until its running job finishes
+        for name in self.pending:
+            if name not in self.active:
+                self.active.add(name)
+                return self.pending.pop(name)
+        return None
+
+    def recognize(self, job):
+        while job is not None:
+            try:
+                lines = self.monitor.recognize_frame(job)
+                if lines is not None:
+                    self.match(job, lines)
+            except Exception as e:
+                logging.error(f"Error checking message: {str(e)}")
+
+            with self.lock:
+                self.active.discard(job["region"].name)
+                job = self.next_job()
+                if job is None:
+                    self.in_flight -= 1
+
+    def match(self, job, lines):
+        region = job["region"]
+        with self.match_lock:
+            if not region.has_responded:
+                self.monitor.process_lines(lines, dispatch=self.dispatch, detected_at=job["captured_at"], region=region)
+
+    def dispatch(self, message, detected_at=None, channel_id=None):
+        self.send_pool.submit(self.monitor.send_discord_message, message, detected_at, channel_id)
+
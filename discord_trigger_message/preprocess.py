@@ -0,0 +1,122 @@
+import threading
+from PIL import Image
+import numpy as np
+
+RESAMPLING_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS
+}
+
+def otsu_threshold(pixels):
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    background_count = np.cumsum(histogram)
+    background_sum = np.cumsum(histogram * levels)
+    foreground_count = background_count[-1] - background_count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        background_mean = background_sum / background_count
+        foreground_mean = (background_sum[-1] - background_sum) / foreground_count
+        variance = background_count * foreground_count * (background_mean - foreground_mean) ** 2
+    return int(np.argmax(np.nan_to_num(variance)))
+
+class OCRPreprocessor:
+    """Single-channel preprocessing on NumPy buffers that are reused between frames.
+
+    Converts to grayscale, scales by whole factors with repeat/block-mean (or a
+    cheap PIL filter otherwise), inverts Discord's dark theme so text is dark on
+    light, and binarizes with Otsu or an adaptive local-mean threshold. Buffers
+    are kept per thread, so the returned image is only valid until the next call
+    from the same thread.
+    """
+
+    def __init__(self, adaptive_window=15, adaptive_offset=10):
+        self.adaptive_window = adaptive_window
+        self.adaptive_offset = adaptive_offset
+        self.local = threading.local()
+
+    def buffer(self, name, shape, dtype=np.uint8):
+        buffers = getattr(self.local, "buffers", None)
+        if buffers is None:
+            buffers = self.local.buffers = {}
+        array = buffers.get(name)
+        if array is None or array.shape != shape or array.dtype != dtype:
+            array = buffers[name] = np.empty(shape, dtype=dtype)
+        return array
+
+    def scale(self, pixels, scale, resample):
+        height, width = pixels.shape
+        factor = round(scale)
+        if factor >= 2 and abs(scale - factor) < 1e-6:
+            scaled = self.buffer("scaled", (height * factor, width * factor))
+            scaled.reshape(height, factor, width, factor)[...] = pixels[:, None, :, None]
+            return scaled
+
+        factor = round(1 / scale) if scale > 0 else 0
+        if factor >= 2 and abs(1 / scale - factor) < 1e-6 and height >= factor and width >= factor:
+            height, width = height // factor, width // factor
+            blocks = pixels[:height * factor, :width * factor].reshape(height, factor, width, factor)
+            sums = self.buffer("block_sums", (height, width), np.uint32)
+            blocks.sum(axis=(1, 3), dtype=np.uint32, out=sums)
+            sums //= factor * factor
+            scaled = self.buffer("scaled", (height, width))
+            scaled[...] = sums
+            return scaled
+
+        new_size = (int(width * scale), int(height * scale))
+        if new_size[0] <= 0 or new_size[1] <= 0 or new_size == (width, height):
+            return pixels
+        image = Image.fromarray(pixels).resize(new_size, RESAMPLING_FILTERS.get(resample, Image.Resampling.BILINEAR))
+        return np.asarray(image)
+
+    def adaptive_threshold(self, pixels):
+        height, width = pixels.shape
+        radius = self.adaptive_window // 2
+        integral = self.buffer("integral", (height + 1, width + 1), np.int64)
+        integral[0, :] = 0
+        integral[:, 0] = 0
+        np.cumsum(pixels, axis=0, dtype=np.int64, out=integral[1:, 1:])
+        np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+
+        rows = np.arange(height)
+        columns = np.arange(width)
+        top = np.clip(rows - radius, 0, height)
+        bottom = np.clip(rows + radius + 1, 0, height)
+        left = np.clip(columns - radius, 0, width)
+        right = np.clip(columns + radius + 1, 0, width)
+
+        sums = (integral[np.ix_(bottom, right)] - integral[np.ix_(top, right)]
+                - integral[np.ix_(bottom, left)] + integral[np.ix_(top, left)])
+        area = np.outer(bottom - top, right - left)
+        mask = self.buffer("mask", (height, width), np.bool_)
+        np.greater_equal(pixels * area, sums - self.adaptive_offset * area, out=mask)
+        return mask
+
+    def process(self, image, scale=1.0, resample="bilinear", binarize="none", invert="auto"):
+        pixels = np.asarray(image.convert("L"))
+        pixels = self.scale(pixels, scale, resample)
+
+        if invert is True or invert == "on" or (invert == "auto" and pixels.mean() < 128):
+            inverted = self.buffer("inverted", pixels.shape)
+            np.subtract(255, pixels, out=inverted)
+            pixels = inverted
+
+        if binarize == "otsu":
+            mask = self.buffer("mask", pixels.shape, np.bool_)
+            np.greater(pixels, otsu_threshold(pixels), out=mask)
+        elif binarize == "adaptive":
+            mask = self.adaptive_threshold(pixels)
+        else:
+            return Image.fromarray(pixels)
+
+        binary = self.buffer("binary", pixels.shape)
+        np.multiply(mask, 255, out=binary, casting="unsafe")
+        return Image.fromarray(binary)
+
+default_preprocessor = OCRPreprocessor()
+
+def prepare_for_ocr(image, scale, resample="bilinear", binarize="none", invert="auto"):
+    return default_preprocessor.process(image, scale=scale, resample=resample, binarize=binarize, invert=invert)
+
@@ -0,0 +1,109 @@
+import logging
+
+from .rules import RuleSet
+from .templates import TemplateMatcher
+
+def ocr_settings(config):
+    return {
+        "scale": config["ocr_resolution"],
+        "resample": config.get("ocr_resample", "lanczos"),
+        "binarize": config.get("ocr_binarize", "none"),
+        "invert": config.get("ocr_invert", "off")
+    }
+
+def target_usernames(config):
+    targets = list(config.get("target_usernames", []))
+    if config.get("target_username") and config["target_username"] not in targets:
+        targets.append(config["target_username"])
+    return targets
+
+def is_target_author(config, author):
+    targets = target_usernames(config)
+    if not targets:
+        return True
+    if author is None:
+        return False
+    if not config["case_sensitive"]:
+        return author.lower() in {target.lower() for target in targets}
+    return author in targets
+
+class MonitorRegion:
+    """One monitored part of the screen with its own triggers and response target.
+
+    Entries of the "regions" config list overlay the top-level config, so a
+    region only lists what differs from it, typically message_area plus
+    keywords/response/channel_id or rules. Without "regions" the top-level
+    config is a single region named "main" with unprefixed capture areas.
+    """
+
+    def __init__(self, name, config, prefix=""):
+        self.name = name
+        self.config = config
+        self.prefix = prefix
+        self.rules = RuleSet.from_config(config)
+        self.templates = self.build_templates()
+        self.has_responded = False
+        self.triggers = 0
+        self.visible = set()
+
+    def build_templates(self):
+        if self.config.get("detection_engine", "ocr") != "template":
+            return None
+        if self.config.get("fuzzy_matching") or any(rule.patterns for rule in self.rules.rules):
+            logging.warning(f"Region '{self.name}' has regex or fuzzy triggers that templates cannot detect, using OCR on every frame")
+            return None
+        keywords = list(dict.fromkeys(keyword for rule in self.rules.rules for keyword in rule.keywords))
+        return TemplateMatcher.from_config(self.config, keywords)
+
+    @classmethod
+    def from_config(cls, config):
+        entries = config.get("regions") or []
+        if not entries:
+            return [cls("main", config)]
+
+        base = {key: value for key, value in config.items() if key != "regions"}
+        regions = []
+        for index, entry in enumerate(entries):
+            name = str(entry.get("name") or f"region {index + 1}")
+            if any(region.name == name for region in regions):
+                logging.error(f"Duplicate region name '{name}', ignoring it")
+                continue
+            regions.append(cls(name, dict(base, **entry), prefix=f"{name}/"))
+        return regions
+
+    def capture_areas(self):
+        areas = {self.prefix + "message": self.config["message_area"]}
+        if self.config.get("username_mode", "area") == "area" and self.target_usernames():
+            areas[self.prefix + "username"] = self.config["username_area"]
+        return areas
+
+    def ocr_settings(self):
+        return ocr_settings(self.config)
+
+    def target_usernames(self):
+        return target_usernames(self.config)
+
+    def is_target_author(self, author):
+        return is_target_author(self.config, author)
+
+    def carry_state(self, previous):
+        """Keep trigger counts and fired rules of the same region across a config reload"""
+        self.triggers = previous.triggers
+        self.visible = previous.visible
+        rules = {rule.name: rule for rule in previous.rules.rules}
+        for rule in self.rules.rules:
+            if rule.name in rules:
+                rule.fired = rules[rule.name].fired
+                rule.last_fired = rules[rule.name].last_fired
+        self.has_responded = self.rules.exhausted
+
+    def rearm(self):
+        """Let the rules fire again, keeping the template row cache"""
+        self.has_responded = False
+        self.rules.reset()
+
+    def reset(self):
+        self.rearm()
+        self.visible = set()
+        if self.templates is not None:
+            self.templates.reset()
@@ -0,0 +1,86 @@
+import time
+
+from .capture import RecordingFrameSource
+
+def record_frames(monitor, directory, frames):
+    source = RecordingFrameSource(monitor.frame_source, directory)
+    areas = monitor.capture_areas()
+    print(f"Recording {frames} frames to {directory}...")
+    try:
+        for _ in range(frames):
+            source.capture(areas)
+            time.sleep(monitor.config["scan_interval"])
+    finally:
+        source.close()
+    print("Recording finished. Fill in the \"expect\" keywords in manifest.jsonl to use it as ground truth.")
+
+def run_replay(monitor, source, max_frames=None):
+    """Drive the real capture, OCR and matching stages from a recorded or synthetic source"""
+    sent = []
+    monitor.frame_source = source
+    monitor.initial_scan = False
+    monitor.reset_regions()
+    monitor.processed_messages.clear()
+    monitor.frame_gate.reset()
+    monitor.timings.reset()
+    monitor.frames_processed = 0
+    monitor.frames_skipped = 0
+
+    pixels_before = monitor.ocr_pixels()
+    frames = 0
+    true_positives = 0
+    false_positives = 0
+    false_negatives = 0
+    labelled = True
+    start = time.perf_counter()
+
+    while not source.exhausted and (max_frames is None or frames < max_frames):
+        frames += 1
+        monitor.last_trigger = None
+        for job in monitor.capture_frame() or ():
+            lines = monitor.recognize_frame(job)
+            if lines is not None:
+                monitor.process_lines(lines, dispatch=lambda message, *args: sent.append(message),
+                                      detected_at=job["captured_at"], region=job["region"])
+        monitor.rearm_regions()
+
+        expected = source.labels()
+        if expected is None:
+            labelled = False
+            continue
+        triggered = monitor.last_trigger["keywords"] if monitor.last_trigger else []
+        if triggered and set(triggered) & set(expected):
+            true_positives += 1
+        elif triggered:
+            false_positives += 1
+        elif expected:
+            false_negatives += 1
+
+    elapsed = time.perf_counter() - start
+    report = {
+        "frames": frames,
+        "frames_processed": monitor.frames_processed,
+        "frames_skipped": monitor.frames_skipped,
+        "triggers": len(sent),
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        "ocr_pixels": monitor.ocr_pixels() - pixels_before,
+        "ocr_pixels_per_frame": round((monitor.ocr_pixels() - pixels_before) / frames) if frames else 0,
+        "latency": monitor.timings.summary()
+    }
+    if labelled:
+        report["true_positives"] = true_positives
+        report["false_positives"] = false_positives
+        report["false_negatives"] = false_negatives
+        report["precision"] = round(true_positives / (true_positives + false_positives), 4) if true_positives + false_positives else None
+        report["recall"] = round(true_positives / (true_positives + false_negatives), 4) if true_positives + false_negatives else None
+    return report
+
+def print_report(report):
+    for key, value in report.items():
+        if key == "latency":
+            continue
+        print(f"{key}: {value}")
+    for stage, stats in report.get("latency", {}).items():
+        print(f"{stage}: p50 {stats['p50_ms']} ms | p95 {stats['p95_ms']} ms | p99 {stats['p99_ms']} ms | n={stats['count']}")
+
@@ -0,0 +1,106 @@
+import logging
+import re
+
+from .matching import KeywordMatcher
+
+class TriggerRule:
+    """One trigger: what to look for, what to answer, where, and when it may fire again"""
+
+    def __init__(self, name, keywords=(), patterns=(), response="", channel_id="", cooldown=0.0, rearm="once"):
+        self.name = name
+        self.keywords = [keyword for keyword in keywords if keyword]
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self.response = response
+        self.channel_id = channel_id
+        self.cooldown = float(cooldown)
+        self.rearm = rearm
+        self.fired = 0
+        self.last_fired = None
+
+    @classmethod
+    def from_dict(cls, data, config, index=0):
+        keywords = data.get("keywords", [])
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        return cls(
+            data.get("name") or f"rule {index + 1}",
+            keywords=keywords,
+            patterns=data.get("patterns", []),
+            response=data.get("response", config.get("response", "")),
+            channel_id=data.get("channel_id") or config.get("channel_id", ""),
+            cooldown=data.get("cooldown", 0.0),
+            rearm=data.get("rearm", "once")
+        )
+
+    def reset(self):
+        self.fired = 0
+        self.last_fired = None
+
+    def armed(self, now):
+        if self.rearm == "once":
+            return not self.fired
+        return self.last_fired is None or now - self.last_fired >= self.cooldown
+
+    def fire(self, now):
+        self.fired += 1
+        self.last_fired = now
+
+class RuleSet:
+    """Compiles the triggers of every rule into one matcher and maps hits back to their rules.
+
+    The legacy keywords/regex_keywords/response/channel_id settings become a
+    rule named "default" that fires once, like before rules existed.
+    """
+
+    def __init__(self, rules, config):
+        self.rules = rules
+        self.owners = {}
+        keywords = []
+        patterns = []
+        for rule in rules:
+            for keyword in rule.keywords:
+                if keyword not in self.owners:
+                    keywords.append(keyword)
+                self.owners.setdefault(keyword, []).append(rule)
+            for pattern in rule.patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    logging.error(f"Invalid regex trigger '{pattern}' in rule '{rule.name}', ignoring it: {str(e)}")
+                    continue
+                if pattern not in self.owners:
+                    patterns.append(pattern)
+                self.owners.setdefault(pattern, []).append(rule)
+        self.matcher = KeywordMatcher.from_config(config, keywords=keywords, patterns=patterns)
+
+    @classmethod
+    def from_config(cls, config):
+        rules = [TriggerRule.from_dict(data, config, index) for index, data in enumerate(config.get("rules", []))]
+        keywords = config.get("keywords") or []
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        if keywords or config.get("regex_keywords"):
+            rules.insert(0, TriggerRule(
+                "default",
+                keywords=keywords,
+                patterns=config.get("regex_keywords", []),
+                response=config.get("response", ""),
+                channel_id=config.get("channel_id", "")
+            ))
+        return cls(rules, config)
+
+    @property
+    def exhausted(self):
+        return bool(self.rules) and all(rule.rearm == "once" and rule.fired for rule in self.rules)
+
+    def reset(self):
+        for rule in self.rules:
+            rule.reset()
+
+    def match(self, line):
+        matches = {}
+        for hit in self.matcher.match(line):
+            for rule in self.owners.get(hit, ()):
+                matches.setdefault(rule, []).append(hit)
+        return list(matches.items())
+
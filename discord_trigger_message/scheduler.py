@@ -0,0 +1,123 @@
+import os
+import time
+
+class ScanScheduler:
+    """Deadline-based scan timing on the monotonic clock.
+
+    Scans run every min_interval while the monitored area keeps changing; each
+    idle scan stretches the interval by backoff up to max_interval, and the
+    first change snaps it back. Missed deadlines are not caught up in a burst.
+    """
+
+    def __init__(self, min_interval, max_interval=None, backoff=1.5):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval or min_interval, min_interval)
+        self.backoff = backoff
+        self.interval = min_interval
+        self.next_deadline = time.monotonic()
+
+    def time_until_due(self):
+        return max(0.0, self.next_deadline - time.monotonic())
+
+    def due(self):
+        return time.monotonic() >= self.next_deadline
+
+    def wait(self, stop_event):
+        timeout = self.time_until_due()
+        if timeout > 0:
+            stop_event.wait(timeout)
+        return not stop_event.is_set()
+
+    def next_interval(self, active):
+        if active:
+            return self.min_interval
+        return min(self.max_interval, self.interval * self.backoff)
+
+    def completed(self, active):
+        self.interval = self.next_interval(active)
+        self.next_deadline = max(self.next_deadline + self.interval, time.monotonic())
+
+    def format_status(self):
+        return f" | Scan: {1 / self.interval:.1f} Hz"
+
+    def stats(self):
+        return {"interval_ms": round(self.interval * 1000, 2)}
+
+    @classmethod
+    def from_config(cls, config):
+        interval = config["scan_interval"]
+        kwargs = {
+            "max_interval": config.get("scan_interval_max", max(interval, 0.5)),
+            "backoff": config.get("scan_backoff", 1.5)
+        }
+        if config.get("adaptive_rate", True):
+            return AdaptiveRateController(interval, cpu_budget=config.get("cpu_budget", 0.5), **kwargs)
+        return cls(interval, **kwargs)
+
+def cpu_seconds():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+class AdaptiveRateController(ScanScheduler):
+    """Scan scheduler that also keeps the measured cost of scanning inside a CPU budget.
+
+    CPU time of the whole process (OCR threads included) plus reaped tesseract
+    subprocesses is sampled every quarter second. The cost per scan sets a
+    floor on the interval so scanning uses at most cpu_budget of one core,
+    while the activity back-off of ScanScheduler still applies above it.
+    """
+
+    def __init__(self, min_interval, max_interval=None, backoff=1.5, cpu_budget=0.5, smoothing=0.3):
+        super().__init__(min_interval, max_interval=max_interval, backoff=backoff)
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+        self.tick_cost = 0.0
+        self.cpu_usage = 0.0
+        self.change_rate = 0.0
+        self.scan_rate = 0.0
+        self.window_start = time.monotonic()
+        self.window_cpu = cpu_seconds()
+        self.window_ticks = 0
+
+    def smooth(self, previous, value):
+        return previous + self.smoothing * (value - previous)
+
+    def sample(self):
+        now = time.monotonic()
+        elapsed = now - self.window_start
+        if elapsed < 0.25 or not self.window_ticks:
+            return
+        cpu = cpu_seconds()
+        used = cpu - self.window_cpu
+        self.cpu_usage = self.smooth(self.cpu_usage, used / elapsed)
+        self.tick_cost = self.smooth(self.tick_cost, used / self.window_ticks)
+        self.scan_rate = self.window_ticks / elapsed
+        self.window_start = now
+        self.window_cpu = cpu
+        self.window_ticks = 0
+
+    def next_interval(self, active):
+        self.window_ticks += 1
+        self.change_rate = self.smooth(self.change_rate, 1.0 if active else 0.0)
+        self.sample()
+
+        interval = super().next_interval(active)
+        if self.cpu_budget > 0:
+            interval = max(interval, self.tick_cost / self.cpu_budget)
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def format_status(self):
+        return (f" | Scan: {self.scan_rate:.1f}/{1 / self.interval:.1f} Hz, CPU {self.cpu_usage:.0%}"
+                f" of {self.cpu_budget:.0%}, changing {self.change_rate:.0%}")
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({
+            "scan_rate_hz": round(self.scan_rate, 2),
+            "cpu_usage": round(self.cpu_usage, 3),
+            "cpu_budget": self.cpu_budget,
+            "tick_cost_ms": round(self.tick_cost * 1000, 2),
+            "change_rate": round(self.change_rate, 3)
+        })
+        return stats
+
@@ -0,0 +1,71 @@
+import json
+import logging
+import threading
+import time
+import requests
+
+class DiscordSender:
+    """Keeps a pooled keep-alive session to Discord and pre-builds message requests"""
+
+    api_base = "https://discord.com/api/v10"
+
+    def __init__(self, token, max_retries=3, timeout=10):
+        self.token = token
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": token,
+            "Content-Type": "application/json"
+        })
+        self.prepared = {}
+        self.lock = threading.Lock()
+
+    def prepare(self, channel_id, message):
+        request = requests.Request(
+            "POST",
+            f"{self.api_base}/channels/{channel_id}/messages",
+            data=json.dumps({"content": message})
+        )
+        prepared = self.session.prepare_request(request)
+        with self.lock:
+            self.prepared[(channel_id, message)] = prepared
+        return prepared
+
+    def warm(self):
+        try:
+            self.session.get(f"{self.api_base}/gateway", timeout=self.timeout)
+            logging.info("Discord connection warmed up")
+        except Exception as e:
+            logging.warning(f"Could not warm up Discord connection: {str(e)}")
+
+    def send(self, channel_id, message, detected_at=None):
+        with self.lock:
+            prepared = self.prepared.get((channel_id, message))
+        if prepared is None:
+            prepared = self.prepare(channel_id, message)
+
+        for attempt in range(self.max_retries + 1):
+            response = self.session.send(prepared.copy(), timeout=self.timeout)
+            if response.status_code != 429:
+                break
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is None:
+                try:
+                    retry_after = response.json().get("retry_after", 1)
+                except ValueError:
+                    retry_after = 1
+            if attempt < self.max_retries:
+                logging.warning(f"Rate limited by Discord, retrying in {float(retry_after):.2f}s")
+                time.sleep(float(retry_after))
+
+        response.raise_for_status()
+        if detected_at is not None:
+            logging.info(f"Detection to send latency: {(time.perf_counter() - detected_at) * 1000:.1f} ms")
+        return response
+
+    def close(self):
+        self.session.close()
+
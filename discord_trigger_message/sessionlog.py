@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+
+def empty_summary():
+    return {
+        "records": 0,
+        "sessions": 0,
+        "triggers": 0,
+        "sends": 0,
+        "send_failures": 0,
+        "first": None,
+        "last": None,
+        "rules": {},
+        "last_session": None
+    }
+
+def summarize(summary, record):
+    kind = record.get("type")
+    summary["records"] += 1
+    summary["first"] = summary["first"] or record.get("t")
+    summary["last"] = record.get("t") or summary["last"]
+    if kind == "session_end":
+        summary["sessions"] += 1
+        summary["last_session"] = record.get("session")
+    elif kind == "trigger":
+        summary["triggers"] += 1
+        key = record.get("rule", "")
+        if record.get("region") and record["region"] != "main":
+            key = f"{record['region']}/{key}"
+        summary["rules"][key] = summary["rules"].get(key, 0) + 1
+    elif kind == "send":
+        summary["sends"] += 1
+        if not record.get("ok"):
+            summary["send_failures"] += 1
+
+class SessionLog:
+    """Append-only JSON-lines log of sessions and trigger events with size-based rotation.
+
+    Records are queued and written in batches by a background thread, so the
+    scan loop never waits on disk. A constant-size summary index is rewritten
+    after each batch, which lets stats be answered without reading the log.
+    """
+
+    def __init__(self, path="session_log.jsonl", max_bytes=5 * 1024 * 1024, backups=5,
+                 flush_interval=1.0, batch_size=256):
+        self.path = path
+        self.index_path = path + ".index.json"
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.summary = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            path=config.get("session_log", "session_log.jsonl"),
+            max_bytes=config.get("session_log_max_bytes", 5 * 1024 * 1024),
+            backups=config.get("session_log_backups", 5)
+        )
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.writer_loop, name="session-log", daemon=True)
+        self.thread.start()
+
+    def log(self, kind, **fields):
+        """Queue a record for the writer thread; records are ignored while the log is not started"""
+        if self.thread is None:
+            return
+        record = {"t": datetime.now().isoformat(timespec="seconds"), "type": kind}
+        record.update(fields)
+        self.queue.put(record)
+
+    def close(self):
+        if self.thread is None:
+            self.flush()
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def writer_loop(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            stop = record is None
+            if not stop:
+                batch.append(record)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                else:
+                    batch.append(record)
+            self.write(batch)
+            if stop:
+                self.flush()
+                return
+
+    def flush(self):
+        batch = []
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:
+                batch.append(record)
+        self.write(batch)
+
+    def write(self, records):
+        if not records:
+            return
+        with self.lock:
+            try:
+                # Scan for a missing index before appending, or the new records are counted twice
+                summary = self.load_summary()
+                payload = "".join(json.dumps(record) + "\n" for record in records)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(payload)
+                    size = f.tell()
+                for record in records:
+                    summarize(summary, record)
+                self.save_summary(summary)
+                if size >= self.max_bytes:
+                    self.rotate()
+            except OSError as e:
+                logging.error(f"Error writing session log: {str(e)}")
+
+    def rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for number in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{number}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        logging.info(f"Rotated session log {self.path}")
+
+    def load_summary(self):
+        if self.summary is None:
+            self.summary = read_summary(self.index_path) or self.scan()
+        return self.summary
+
+    def save_summary(self, summary):
+        temporary = self.index_path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(summary, f)
+        os.replace(temporary, self.index_path)
+
+    def files(self):
+        """Log files from oldest to newest"""
+        rotated = [f"{self.path}.{number}" for number in range(self.backups, 0, -1)]
+        return [path for path in rotated + [self.path] if os.path.exists(path)]
+
+    def scan(self):
+        """Rebuild the summary by streaming every log file once"""
+        summary = empty_summary()
+        for path in self.files():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        summarize(summary, json.loads(line))
+                    except ValueError:
+                        continue
+        return summary
+
+    def stats(self, rebuild=False):
+        with self.lock:
+            if rebuild:
+                self.summary = None
+                if os.path.exists(self.index_path):
+                    os.remove(self.index_path)
+            missing = not os.path.exists(self.index_path)
+            summary = self.load_summary()
+            if missing and self.files():
+                self.save_summary(summary)
+            return summary
+
+def read_summary(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        logging.warning(f"Could not read session log index, rebuilding it: {str(e)}")
+        return None
+
+def print_stats(summary):
+    print(f"Sessions: {summary['sessions']}")
+    print(f"Triggers: {summary['triggers']}")
+    print(f"Messages sent: {summary['sends'] - summary['send_failures']} ({summary['send_failures']} failed)")
+    print(f"First record: {summary['first']}")
+    print(f"Last record: {summary['last']}")
+    for rule, count in sorted(summary["rules"].items(), key=lambda item: -item[1]):
+        print(f"  {rule}: {count}")
+    session = summary.get("last_session")
+    if session:
+        print(f"Last session: {session.get('start_time')} - {session.get('end_time')}, "
+              f"{session.get('messages_detected', 0)} detected, {session.get('messages_sent', 0)} sent")
@@ -0,0 +1,195 @@
+import glob
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from .scheduler import cpu_seconds
+from .sessionlog import SessionLog
+from .timing import StageTimings
+
+DEFAULT_BUDGETS = {
+    "max_rss_mb": 512,
+    "max_rss_growth_mb": 64,
+    "max_traced_growth_mb": 32,
+    "max_open_files": 256,
+    "max_temp_files": 32,
+    "max_tick_p95_ms": 500,
+    "max_cpu_per_tick_ms": 250,
+    "max_config_bytes": 65536
+}
+
+def current_rss():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+def open_files():
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    try:
+        import psutil
+        process = psutil.Process()
+        return process.num_handles() if os.name == "nt" else process.num_fds()
+    except ImportError:
+        return None
+
+def tesseract_temp_files():
+    return len(glob.glob(os.path.join(tempfile.gettempdir(), "tess_*")))
+
+def megabytes(value):
+    return None if value is None else round(value / (1024 * 1024), 2)
+
+def run_soak(monitor, source, budgets=None, sample_every=500, warmup=0.1, simulated_tick=0.5):
+    """Drive check_for_message from a synthetic source and check memory, file and CPU budgets.
+
+    RSS, traced Python memory, open file descriptors and leftover tesseract temp
+    files are sampled every sample_every ticks; growth is measured from the end
+    of the warm-up fraction so caches filling up to their bounds is not counted.
+    """
+    budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+    sent = []
+    monitor.frame_source = source
+    monitor.initial_scan = False
+    monitor.reset_regions()
+    monitor.processed_messages.clear()
+    monitor.frame_gate.reset()
+    monitor.timings.reset()
+    monitor.frames_processed = 0
+    monitor.frames_skipped = 0
+    detected_before = monitor.messages_detected
+
+    log_directory = tempfile.TemporaryDirectory(prefix="soak-")
+    original_log = monitor.session_log
+    monitor.session_log = SessionLog(os.path.join(log_directory.name, "session_log.jsonl"), max_bytes=256 * 1024, backups=2)
+    monitor.session_log.start()
+
+    ticks = StageTimings()
+    cpu_total = 0.0
+    samples = []
+    failures = []
+    baseline = None
+    warmup_ticks = max(1, int(source.frames * warmup))
+    tracemalloc.start(10)
+    started = time.perf_counter()
+
+    def sample(tick):
+        traced, peak = tracemalloc.get_traced_memory()
+        entry = {
+            "tick": tick,
+            "simulated_hours": round(tick * simulated_tick / 3600, 3),
+            "rss_mb": megabytes(current_rss()),
+            "traced_mb": megabytes(traced),
+            "traced_peak_mb": megabytes(peak),
+            "open_files": open_files(),
+            "temp_files": tesseract_temp_files(),
+            "dedup_entries": len(monitor.processed_messages),
+            "band_cache_entries": len(monitor.band_ocr.cache),
+            "config_bytes": len(json.dumps(monitor.config))
+        }
+        samples.append(entry)
+        logging.info(f"Soak tick {tick}: RSS {entry['rss_mb']} MB, traced {entry['traced_mb']} MB, "
+                     f"{entry['open_files']} open files, {entry['dedup_entries']} dedup entries")
+        return entry
+
+    def check(entry):
+        limits = (
+            ("rss_mb", "max_rss_mb"),
+            ("open_files", "max_open_files"),
+            ("temp_files", "max_temp_files"),
+            ("config_bytes", "max_config_bytes")
+        )
+        for key, budget in limits:
+            if entry[key] is not None and entry[key] > budgets[budget]:
+                failures.append(f"{key} {entry[key]} exceeds {budget} {budgets[budget]} at tick {entry['tick']}")
+        if baseline is not None:
+            for key, budget in (("rss_mb", "max_rss_growth_mb"), ("traced_mb", "max_traced_growth_mb")):
+                if entry[key] is not None and baseline["sample"][key] is not None:
+                    growth = entry[key] - baseline["sample"][key]
+                    if growth > budgets[budget]:
+                        failures.append(f"{key} grew {growth:.2f} MB since warm-up, over {budget} {budgets[budget]} at tick {entry['tick']}")
+
+    tick = 0
+    try:
+        while not source.exhausted and not failures:
+            tick += 1
+            cpu_start = cpu_seconds()
+            with ticks.measure("tick"):
+                monitor.check_for_message(dispatch=lambda message, *args: sent.append(message))
+            cpu_total += cpu_seconds() - cpu_start
+            monitor.rearm_regions()
+
+            if tick == warmup_ticks:
+                baseline = {"sample": sample(tick), "snapshot": tracemalloc.take_snapshot()}
+            elif tick % sample_every == 0:
+                check(sample(tick))
+
+        if samples and samples[-1]["tick"] == tick:
+            final = samples[-1]
+        else:
+            final = sample(tick)
+            check(final)
+        top_allocators = []
+        if baseline is not None:
+            statistics = tracemalloc.take_snapshot().compare_to(baseline["snapshot"], "lineno")
+            top_allocators = [str(stat) for stat in statistics[:10]]
+    finally:
+        tracemalloc.stop()
+        monitor.session_log.close()
+        monitor.session_log = original_log
+        log_directory.cleanup()
+
+    latency = ticks.summary()
+    cpu_per_tick = cpu_total * 1000 / max(1, tick)
+    if "tick" in latency and latency["tick"]["p95_ms"] > budgets["max_tick_p95_ms"]:
+        failures.append(f"tick p95 {latency['tick']['p95_ms']} ms exceeds max_tick_p95_ms {budgets['max_tick_p95_ms']}")
+    if cpu_per_tick > budgets["max_cpu_per_tick_ms"]:
+        failures.append(f"CPU per tick {cpu_per_tick:.2f} ms exceeds max_cpu_per_tick_ms {budgets['max_cpu_per_tick_ms']}")
+
+    elapsed = time.perf_counter() - started
+    return {
+        "passed": not failures,
+        "failures": failures,
+        "ticks": tick,
+        "simulated_hours": round(tick * simulated_tick / 3600, 3),
+        "elapsed_seconds": round(elapsed, 1),
+        "ticks_per_second": round(tick / elapsed, 1) if elapsed else None,
+        "messages_detected": monitor.messages_detected - detected_before,
+        "responses": len(sent),
+        "cpu_per_tick_ms": round(cpu_per_tick, 2),
+        "budgets": budgets,
+        "baseline": baseline["sample"] if baseline else None,
+        "final": final,
+        "top_allocators": top_allocators,
+        "latency": dict(latency, **monitor.timings.summary()),
+        "samples": samples
+    }
+
+def print_soak_report(report):
+    print(f"Soak {'passed' if report['passed'] else 'FAILED'}: {report['ticks']} ticks "
+          f"({report['simulated_hours']} simulated hours) in {report['elapsed_seconds']} s, "
+          f"{report['ticks_per_second']} ticks/s, {report['cpu_per_tick_ms']} ms CPU per tick")
+    baseline, final = report["baseline"], report["final"]
+    for key in ("rss_mb", "traced_mb", "open_files", "temp_files", "dedup_entries", "band_cache_entries", "config_bytes"):
+        start = baseline[key] if baseline else None
+        print(f"{key}: {start} -> {final[key]}")
+    for stage, stats in report["latency"].items():
+        print(f"{stage}: p50 {stats['p50_ms']} ms | p95 {stats['p95_ms']} ms | p99 {stats['p99_ms']} ms | n={stats['count']}")
+    if report["top_allocators"]:
+        print("Top allocation growth since warm-up:")
+        for line in report["top_allocators"]:
+            print(f"  {line}")
+    for failure in report["failures"]:
+        print(f"FAIL: {failure}")
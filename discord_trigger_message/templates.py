@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .preprocess import prepare_for_ocr
+
+def load_template_font(path=None, size=16):
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError as e:
+            logging.warning(f"Could not load template font {path}, using the default font: {str(e)}")
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+def ink_mask(image):
+    """Text pixels of an image, binarized the same way as OCR input"""
+    return np.asarray(prepare_for_ocr(image, 1.0, binarize="otsu", invert="auto")) < 128
+
+def trim(ink):
+    rows = np.flatnonzero(ink.any(axis=1))
+    columns = np.flatnonzero(ink.any(axis=0))
+    if not rows.size:
+        return None
+    return ink[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+
+def render_template(text, font):
+    left, top, right, bottom = font.getbbox(text)
+    image = Image.new("L", (right - left + 4, bottom - top + 4), 255)
+    ImageDraw.Draw(image).text((2 - left, 2 - top), text, fill=0, font=font)
+    return trim(np.asarray(image) < 128)
+
+def ink_bands(ink, merge_gap=2, min_height=4):
+    bands = []
+    for row in np.flatnonzero(ink.any(axis=1)):
+        if bands and row - bands[-1][1] <= merge_gap:
+            bands[-1][1] = row + 1
+        else:
+            bands.append([row, row + 1])
+    return [(top, bottom) for top, bottom in bands if bottom - top >= min_height]
+
+def normalized(values):
+    values = values.astype(np.float32) - values.mean()
+    norm = np.sqrt((values * values).sum())
+    return values / norm if norm else None
+
+class KeywordTemplate:
+    def __init__(self, keyword, ink):
+        self.keyword = keyword
+        self.height, self.width = ink.shape
+        self.profile = normalized(ink.sum(axis=0))
+        self.pixels = normalized(ink.ravel())
+
+class TemplateMatcher:
+    """Nominates lines that may contain a keyword without running OCR.
+
+    Each text row of the binarized frame is reduced to a column ink profile
+    and correlated with every keyword template's profile; positions above the
+    threshold are checked with a 2D normalized cross-correlation. Rows are
+    remembered by content, so a frame costs only the rows that are new on
+    screen and rows that were already checked never nominate it again. A hit
+    only means the frame is worth OCR'ing, and OCR confirms the keyword.
+    """
+
+    def __init__(self, templates, threshold=0.75, cache_size=1024, max_checks=8):
+        self.templates = [template for template in templates if template.profile is not None and template.pixels is not None]
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self.max_checks = max_checks
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, keywords):
+        font = load_template_font(config.get("template_font"), config.get("template_font_size", 16))
+        learned = config.get("keyword_templates", {})
+        templates = []
+        for keyword in keywords:
+            for path in learned.get(keyword, []):
+                try:
+                    with Image.open(path) as image:
+                        ink = trim(ink_mask(image))
+                except OSError as e:
+                    logging.warning(f"Could not load template {path} for '{keyword}': {str(e)}")
+                    continue
+                if ink is not None:
+                    templates.append(KeywordTemplate(keyword, ink))
+
+            if keyword in learned and not config.get("template_render", False):
+                continue
+            variants = {keyword} if config.get("case_sensitive") else {keyword, keyword.lower(), keyword.capitalize()}
+            for variant in sorted(variants):
+                ink = render_template(variant, font)
+                if ink is not None:
+                    templates.append(KeywordTemplate(keyword, ink))
+        return cls(templates, threshold=config.get("template_threshold", 0.75))
+
+    def candidates(self, image):
+        """Keywords that may appear in rows not seen before, each with its best correlation score"""
+        ink = ink_mask(image)
+        found = {}
+        for top, bottom in ink_bands(ink):
+            band = ink[top:bottom]
+            key = hashlib.blake2b(np.packbits(band).tobytes() + bytes(str(band.shape), "ascii"), digest_size=16).digest()
+            with self.lock:
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    continue
+                self.cache[key] = True
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            for keyword, score in self.match_band(band).items():
+                found[keyword] = max(score, found.get(keyword, 0.0))
+        return found
+
+    def reset(self):
+        with self.lock:
+            self.cache.clear()
+
+    def match_band(self, band):
+        hits = {}
+        profile = band.sum(axis=0, dtype=np.float32)
+        sums = np.concatenate(([0.0], np.cumsum(profile, dtype=np.float64)))
+        squares = np.concatenate(([0.0], np.cumsum(profile.astype(np.float64) ** 2)))
+        for template in self.templates:
+            width = template.width
+            if template.height > band.shape[0] + 1 or width > band.shape[1] or hits.get(template.keyword, 0.0) >= self.threshold:
+                continue
+            window_sums = sums[width:] - sums[:-width]
+            variance = squares[width:] - squares[:-width] - window_sums * window_sums / width
+            scores = sliding_window_view(profile, width) @ template.profile
+            scores /= np.sqrt(np.maximum(variance, 1e-6))
+
+            positions = np.flatnonzero(scores >= self.threshold)
+            if not positions.size:
+                continue
+            best_positions = positions[np.argsort(scores[positions])[::-1][:self.max_checks]]
+            score = max(self.match_2d(band, template, x) for x in best_positions)
+            if score >= self.threshold:
+                hits[template.keyword] = max(score, hits.get(template.keyword, 0.0))
+        return hits
+
+    def match_2d(self, band, template, x):
+        region = band[:, x:x + template.width]
+        if region.shape[0] < template.height:
+            region = np.pad(region, ((0, template.height - region.shape[0]), (0, 0)))
+        windows = sliding_window_view(region, (template.height, template.width))[:, 0]
+        windows = windows.reshape(windows.shape[0], -1).astype(np.float32)
+        windows -= windows.mean(axis=1, keepdims=True)
+        norms = np.sqrt((windows * windows).sum(axis=1))
+        scores = (windows @ template.pixels) / np.maximum(norms, 1e-6)
+        return float(scores.max())
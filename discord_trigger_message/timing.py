@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+class StageTimings:
+    """Rolling per-stage latency samples with p50/p95/p99 summaries"""
+
+    status_labels = (
+        ("grab", "grab"),
+        ("template", "tmpl"),
+        ("resize", "resize"),
+        ("ocr_username", "ocr-user"),
+        ("ocr_message", "ocr"),
+        ("match", "match"),
+        ("send", "send"),
+        ("end_to_end", "e2e")
+    )
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def record(self, stage, milliseconds):
+        with self.lock:
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.window)
+            samples.append(milliseconds)
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def percentiles(self, stage, points=(50, 95, 99)):
+        with self.lock:
+            samples = sorted(self.samples.get(stage, ()))
+        if not samples:
+            return None
+        return [samples[min(len(samples) - 1, int(len(samples) * point / 100))] for point in points]
+
+    def summary(self):
+        result = {}
+        for stage in list(self.samples):
+            p50, p95, p99 = self.percentiles(stage)
+            result[stage] = {
+                "count": self.counts.get(stage, 0),
+                "p50_ms": round(p50, 2),
+                "p95_ms": round(p95, 2),
+                "p99_ms": round(p99, 2)
+            }
+        return result
+
+    def format_status(self):
+        parts = []
+        for stage, label in self.status_labels:
+            values = self.percentiles(stage)
+            if values is not None:
+                parts.append(f"{label} {values[0]:.0f}/{values[1]:.0f}/{values[2]:.0f}")
+        return " | p50/p95/p99 ms: " + ", ".join(parts) if parts else ""
+
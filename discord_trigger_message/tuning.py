@@ -0,0 +1,103 @@
+import hashlib
+import itertools
+import logging
+import os
+import re
+import time
+from PIL import Image
+
+from .capture import ReplayFrameSource
+from .preprocess import prepare_for_ocr
+
+def tune_ocr(monitor, directory, scales=(0.6, 0.8, 1.0, 1.5, 2.0), psms=(4, 6, 11),
+             resamples=("nearest", "bilinear", "lanczos"), binarizations=("none", "otsu", "adaptive"),
+             oems=(1, 3), tolerance=0.0):
+    """Grid-search OCR settings on labelled captures and save the fastest one that keeps recall"""
+    source = ReplayFrameSource(directory)
+    samples = []
+    seen = set()
+    for entry in source.entries:
+        filename = entry["images"].get("message")
+        if filename is None or "expect" not in entry:
+            continue
+        with Image.open(os.path.join(directory, filename)) as image:
+            image = image.convert("RGB")
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        samples.append((image, set(entry["expect"])))
+
+    expected_total = sum(len(expected) for _, expected in samples)
+    if not samples or expected_total == 0:
+        print("No labelled captures found. Fill in the \"expect\" keywords in manifest.jsonl first.")
+        return None
+
+    results = []
+    combinations = list(itertools.product(scales, psms, resamples, binarizations, oems))
+    print(f"Evaluating {len(combinations)} combinations on {len(samples)} captures...")
+
+    for scale, psm, resample, binarize, oem in combinations:
+        ocr_config = f"--psm {psm} --oem {oem}"
+        found = 0
+        false_hits = 0
+        start = time.perf_counter()
+        try:
+            for image, expected in samples:
+                prepared = prepare_for_ocr(image, scale, resample=resample, binarize=binarize,
+                                           invert=monitor.config.get("ocr_invert", "off"))
+                text = monitor.ocr.image_to_string(prepared, config=ocr_config)
+                hits = set()
+                for line in text.split("\n"):
+                    hits.update(monitor.regions[0].rules.matcher.match(line))
+                found += len(hits & expected)
+                false_hits += len(hits - expected)
+        except Exception as e:
+            logging.warning(f"Skipping {ocr_config} at {scale}x: {str(e)}")
+            continue
+
+        results.append({
+            "scale": scale,
+            "psm": psm,
+            "oem": oem,
+            "resample": resample,
+            "binarize": binarize,
+            "ms_per_frame": (time.perf_counter() - start) * 1000 / len(samples),
+            "recall": found / expected_total,
+            "false_hits": false_hits
+        })
+
+    if not results:
+        print("Every combination failed, configuration left unchanged.")
+        return None
+
+    pareto = [
+        result for result in results
+        if not any(
+            other["ms_per_frame"] <= result["ms_per_frame"] and other["recall"] >= result["recall"]
+            and (other["ms_per_frame"] < result["ms_per_frame"] or other["recall"] > result["recall"])
+            for other in results
+        )
+    ]
+    pareto.sort(key=lambda result: result["ms_per_frame"])
+    best_recall = max(result["recall"] for result in pareto)
+    choice = min(
+        (result for result in pareto if result["recall"] >= best_recall - tolerance),
+        key=lambda result: (result["ms_per_frame"], result["false_hits"])
+    )
+
+    print("\nPareto-optimal settings:")
+    for result in pareto:
+        marker = "*" if result is choice else " "
+        print(f"{marker} {result['scale']:.1f}x psm {result['psm']} oem {result['oem']} {result['resample']}/{result['binarize']}: "
+              f"{result['ms_per_frame']:.1f} ms/frame, recall {result['recall']:.2%}, false hits {result['false_hits']}")
+
+    extra_options = re.sub(r"--(psm|oem)\s+\d+", "", monitor.config["ocr_config"]).split()
+    monitor.config["ocr_resolution"] = choice["scale"]
+    monitor.config["ocr_config"] = " ".join([f"--psm {choice['psm']}", f"--oem {choice['oem']}"] + extra_options)
+    monitor.config["ocr_resample"] = choice["resample"]
+    monitor.config["ocr_binarize"] = choice["binarize"]
+    monitor.save_config()
+    print(f"\nSaved the selected settings to {monitor.config_path}")
+    return choice
+
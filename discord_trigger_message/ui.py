@@ -0,0 +1,529 @@
+import os
+import queue
+import re
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from PIL import ImageTk
+import pyfiglet
+from tabulate import tabulate
+
+from .preprocess import prepare_for_ocr
+
+try:
+    import pyautogui
+    import keyboard
+except Exception:
+    # No display or input access; calibration needs both
+    pyautogui = None
+    keyboard = None
+
+def calibrate_message_area(monitor):
+    print("\nCalibrating message area...")
+    print("1. Move your mouse to the top-left corner of the message area")
+    print("2. Press 'C' to capture the first point")
+    print("3. Move your mouse to the bottom-right corner")
+    print("4. Press 'C' again to capture the second point")
+    print("\nPress Enter to start calibration (ESC to cancel)")
+    
+    input()
+    
+    start_pos = None
+    end_pos = None
+    captured_first = False
+    
+    while True:
+        if keyboard.is_pressed('esc'):
+            print("\nCalibration cancelled")
+            return
+            
+        if keyboard.is_pressed('c'):
+            if not captured_first:
+                start_pos = pyautogui.position()
+                print(f"Start position captured: {start_pos}")
+                captured_first = True
+                time.sleep(0.3)
+            elif captured_first and not end_pos:
+                end_pos = pyautogui.position()
+                print(f"End position captured: {end_pos}")
+                
+                monitor.config["message_area"] = {
+                    "left": min(start_pos[0], end_pos[0]),
+                    "top": min(start_pos[1], end_pos[1]),
+                    "width": abs(end_pos[0] - start_pos[0]),
+                    "height": abs(end_pos[1] - start_pos[1])
+                }
+                
+                monitor.save_config()
+                print("\nMessage area calibrated and saved!")
+                break
+                
+        time.sleep(0.1)
+
+def calibrate_username_area(monitor):
+    print("\nCalibrating username area...")
+    print("1. Move your mouse to the top-left corner of the username area")
+    print("2. Press 'C' to capture the first point")
+    print("3. Move your mouse to the bottom-right corner")
+    print("4. Press 'C' again to capture the second point")
+    print("\nPress Enter to start calibration (ESC to cancel)")
+    
+    input()
+    
+    start_pos = None
+    end_pos = None
+    captured_first = False
+    
+    while True:
+        if keyboard.is_pressed('esc'):
+            print("\nCalibration cancelled")
+            return
+            
+        if keyboard.is_pressed('c'):
+            if not captured_first:
+                start_pos = pyautogui.position()
+                print(f"Start position captured: {start_pos}")
+                captured_first = True
+                time.sleep(0.3)
+            elif captured_first and not end_pos:
+                end_pos = pyautogui.position()
+                print(f"End position captured: {end_pos}")
+                
+                monitor.config["username_area"] = {
+                    "left": min(start_pos[0], end_pos[0]),
+                    "top": min(start_pos[1], end_pos[1]),
+                    "width": abs(end_pos[0] - start_pos[0]),
+                    "height": abs(end_pos[1] - start_pos[1])
+                }
+                
+                monitor.save_config()
+                print("\nUsername area calibrated and saved!")
+                break
+                
+        time.sleep(0.1)
+
+def edit_config(monitor):
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print("\nEdit Configuration")
+    config_menu = [
+        ["1", "Edit keywords", "Modify trigger keywords"],
+        ["2", "Edit response message", "Change automatic response"],
+        ["3", "Edit scan interval", "Adjust scanning frequency"],
+        ["4", "Edit Discord token", "Update Discord authentication"],
+        ["5", "Edit channel ID", "Change target Discord channel"],
+        ["6", "Toggle case sensitivity", "Switch case matching"],
+        ["7", "Edit target usernames", "Set specific usernames to monitor"],
+        ["8", "Toggle whole-word matching", "Only trigger on complete words"],
+        ["9", "Edit regex triggers", "Modify regular expression triggers"],
+        ["10", "Toggle fuzzy matching", "Tolerate OCR misreads in keywords"],
+        ["11", "Edit trigger rules", "Add or remove extra keyword/response rules"],
+        ["12", "Back to main menu", "Return to previous menu"]
+    ]
+    print(tabulate(config_menu, headers=["Option", "Action", "Description"], 
+                  tablefmt="fancy_grid", colalign=("center", "left", "left")))
+    
+    choice = input("\nSelect option: ")
+    
+    if choice == "1":
+        print("\nCurrent keywords:", ", ".join(monitor.config["keywords"]))
+        new_keywords = input("Enter new keywords (comma-separated): ").split(",")
+        monitor.config["keywords"] = [k.strip() for k in new_keywords if k.strip()]
+    elif choice == "2":
+        print("\nCurrent response:", monitor.config["response"])
+        monitor.config["response"] = input("Enter new response: ").strip()
+    elif choice == "3":
+        print("\nCurrent scan interval:", monitor.config["scan_interval"])
+        try:
+            new_interval = float(input("Enter new scan interval (in seconds): "))
+            if new_interval > 0:
+                monitor.config["scan_interval"] = new_interval
+            else:
+                print("Interval must be greater than 0")
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+    elif choice == "4":
+        monitor.config["discord_token"] = input("Enter Discord token: ").strip()
+    elif choice == "5":
+        monitor.config["channel_id"] = input("Enter channel ID: ").strip()
+    elif choice == "6":
+        monitor.config["case_sensitive"] = not monitor.config["case_sensitive"]
+        print(f"\nCase sensitivity is now: {'ON' if monitor.config['case_sensitive'] else 'OFF'}")
+    elif choice == "7":
+        print("\nCurrent target usernames:", ", ".join(monitor.target_usernames()) or "None")
+        new_usernames = input("Enter target usernames (comma-separated, or leave empty to disable): ").split(",")
+        monitor.config["target_usernames"] = [u.strip() for u in new_usernames if u.strip()]
+        monitor.config["target_username"] = ""
+    elif choice == "8":
+        monitor.config["whole_word"] = not monitor.config.get("whole_word", False)
+        print(f"\nWhole-word matching is now: {'ON' if monitor.config['whole_word'] else 'OFF'}")
+    elif choice == "9":
+        print("\nCurrent regex triggers:", ", ".join(monitor.config.get("regex_keywords", [])))
+        new_patterns = input("Enter new regex triggers (comma-separated): ").split(",")
+        monitor.config["regex_keywords"] = [p.strip() for p in new_patterns if p.strip()]
+    elif choice == "10":
+        monitor.config["fuzzy_matching"] = not monitor.config.get("fuzzy_matching", False)
+        print(f"\nFuzzy matching is now: {'ON' if monitor.config['fuzzy_matching'] else 'OFF'}")
+        if monitor.config["fuzzy_matching"]:
+            print(f"Max edit distance: {monitor.config.get('fuzzy_max_distance', 1)}")
+    elif choice == "11":
+        monitor.edit_rules()
+    elif choice == "12":
+        return
+    
+    monitor.save_config()
+    monitor.compile_keywords()
+    print("\nConfiguration saved!")
+
+def edit_rules(monitor):
+    rules = monitor.config.setdefault("rules", [])
+    print("\nCurrent rules:")
+    for index, rule in enumerate(rules, 1):
+        print(f"{index}. {rule.get('name', f'rule {index}')}: {', '.join(rule.get('keywords', []))} -> "
+              f"{rule.get('response', '')} (channel {rule.get('channel_id') or 'default'}, "
+              f"{rule.get('rearm', 'once')}, cooldown {rule.get('cooldown', 0)}s)")
+    action = input("\n(a)dd rule, (r)emove rule or Enter to go back: ").strip().lower()
+
+    if action == "a":
+        rule = {
+            "name": input("Rule name: ").strip() or f"rule {len(rules) + 1}",
+            "keywords": [k.strip() for k in input("Keywords (comma-separated): ").split(",") if k.strip()],
+            "response": input("Response message: ").strip(),
+            "channel_id": input("Channel ID (leave empty for the default channel): ").strip(),
+            "rearm": "cooldown" if input("Fire again after a cooldown? (y/n): ").strip().lower() == "y" else "once",
+            "cooldown": 0.0
+        }
+        if rule["rearm"] == "cooldown":
+            try:
+                rule["cooldown"] = float(input("Cooldown (in seconds): "))
+            except ValueError:
+                print("Invalid input, using a 60 second cooldown.")
+                rule["cooldown"] = 60.0
+        rules.append(rule)
+    elif action == "r":
+        try:
+            rules.pop(int(input("Rule number to remove: ")) - 1)
+        except (ValueError, IndexError):
+            print("Invalid rule number.")
+
+class PreviewWorker:
+    """Runs preview capture, preprocessing and OCR off the Tk thread.
+
+    Only the newest request is kept: a request that has not started is
+    replaced, and work for an outdated request stops between stages. Results
+    go to a queue that the Tk loop polls with after().
+    """
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.condition = threading.Condition()
+        self.request = None
+        self.generation = 0
+        self.closed = False
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="ocr-preview", daemon=True)
+        self.thread.start()
+
+    def submit(self, settings):
+        with self.condition:
+            self.generation += 1
+            self.request = (self.generation, settings)
+            self.condition.notify()
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.request is None and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                generation, settings = self.request
+                self.request = None
+            result = self.process(generation, settings)
+            if result is not None:
+                self.results.put(result)
+
+    def process(self, generation, settings):
+        monitor = self.monitor
+        try:
+            start = time.perf_counter()
+            screenshot = monitor.frame_source.capture({"message": monitor.config["message_area"]})["message"]
+            captured = time.perf_counter()
+            if not self.is_current(generation):
+                return None
+
+            screenshot = prepare_for_ocr(screenshot, **dict(monitor.ocr_settings(), scale=settings["scale"]))
+            prepared = time.perf_counter()
+            if not self.is_current(generation):
+                return None
+
+            text = monitor.ocr.image_to_string(screenshot, config=settings["ocr_config"])
+            finished = time.perf_counter()
+        except Exception as e:
+            return {"generation": generation, "error": str(e)}
+        return {
+            "generation": generation,
+            "text": text,
+            "capture_ms": (captured - start) * 1000,
+            "preprocess_ms": (prepared - captured) * 1000,
+            "ocr_ms": (finished - prepared) * 1000
+        }
+
+def with_psm(ocr_config, psm):
+    """Set the page segmentation mode, keeping the --oem and -c options saved by the tuner"""
+    extra_options = re.sub(r"--psm\s+\d+", "", ocr_config).split()
+    return " ".join([f"--psm {psm}"] + extra_options)
+
+def optimize_ocr(monitor):
+    print("\nOCR Optimization")
+    preview_window = tk.Tk()
+    preview_window.title("OCR Preview")
+    
+    control_frame = ttk.Frame(preview_window, padding="10")
+    control_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    
+    preview_frame = ttk.Frame(preview_window, padding="10")
+    preview_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    
+    preview_text = tk.Text(preview_frame, width=60, height=10)
+    preview_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    
+    resolution_var = tk.DoubleVar(value=monitor.config["ocr_resolution"])
+    ttk.Label(control_frame, text="Resolution Scale:").grid(row=0, column=0, padx=5)
+    resolution_scale = ttk.Scale(
+        control_frame,
+        from_=0.1,
+        to=2.0,
+        orient=tk.HORIZONTAL,
+        variable=resolution_var,
+        length=200
+    )
+    resolution_scale.grid(row=0, column=1, padx=5)
+    
+    current_psm = re.search(r"--psm\s+(\d+)", monitor.config["ocr_config"])
+    psm_var = tk.StringVar(value=current_psm.group(1) if current_psm else "3")
+    ttk.Label(control_frame, text="PSM Mode:").grid(row=1, column=0, padx=5)
+    psm_combo = ttk.Combobox(
+        control_frame,
+        textvariable=psm_var,
+        values=["0", "1", "3", "4", "6", "7", "8", "9", "10", "11", "12", "13"]
+    )
+    psm_combo.grid(row=1, column=1, padx=5)
+    
+    timing_var = tk.StringVar(value="Waiting for the first preview...")
+    ttk.Label(control_frame, textvariable=timing_var).grid(row=3, column=0, columnspan=2, pady=5)
+
+    worker = PreviewWorker(monitor)
+    request_id = None
+    poll_id = None
+
+    def request_preview(delay):
+        # Debounce: every change restarts the delay, so a slider drag sends one request
+        nonlocal request_id
+        if request_id is not None:
+            preview_window.after_cancel(request_id)
+        request_id = preview_window.after(delay, send_request)
+
+    def send_request():
+        nonlocal request_id
+        request_id = None
+        try:
+            worker.submit({"scale": resolution_var.get(), "ocr_config": with_psm(monitor.config["ocr_config"], psm_var.get())})
+        except tk.TclError:
+            pass
+
+    def poll_results():
+        nonlocal poll_id
+        result = None
+        while not worker.results.empty():
+            result = worker.results.get_nowait()
+        if result is not None and worker.is_current(result["generation"]):
+            if "error" in result:
+                timing_var.set(f"Preview failed: {result['error']}")
+            else:
+                preview_text.delete(1.0, tk.END)
+                preview_text.insert(tk.END, result["text"])
+                timing_var.set(f"Capture {result['capture_ms']:.0f} ms | Preprocess {result['preprocess_ms']:.0f} ms | "
+                               f"OCR {result['ocr_ms']:.0f} ms")
+            request_preview(1000)
+        poll_id = preview_window.after(50, poll_results)
+
+    def save_settings():
+        for after_id in (request_id, poll_id):
+            if after_id is not None:
+                preview_window.after_cancel(after_id)
+        worker.close()
+        monitor.config["ocr_resolution"] = resolution_var.get()
+        monitor.config["ocr_config"] = with_psm(monitor.config["ocr_config"], psm_var.get())
+        monitor.save_config()
+        preview_window.destroy()
+    
+    ttk.Button(control_frame, text="Save & Close", command=save_settings).grid(row=2, column=0, columnspan=2, pady=10)
+
+    resolution_var.trace_add("write", lambda *args: request_preview(250))
+    psm_var.trace_add("write", lambda *args: request_preview(250))
+    send_request()
+    poll_results()
+    
+    preview_window.protocol("WM_DELETE_WINDOW", save_settings)
+    preview_window.mainloop()
+
+def view_ocr_area(monitor):
+    print("\nSelect area to view:")
+    print("1. Message area")
+    print("2. Username area")
+    print("3. Keyword template (drag around one keyword in the message area)")
+    choice = input("\nEnter choice (1-3): ")
+    
+    area = monitor.config["username_area"] if choice == "2" else monitor.config["message_area"]
+    area_type = "username" if choice == "2" else "message"
+    
+    screenshot = monitor.frame_source.capture({area_type: area})[area_type]
+    
+    window = tk.Tk()
+    window.title(f"OCR {area_type.title()} Area Preview")
+    
+    photo = ImageTk.PhotoImage(screenshot)
+    
+    canvas = tk.Canvas(window, width=screenshot.width, height=screenshot.height)
+    canvas.pack()
+    canvas.create_image(0, 0, anchor=tk.NW, image=photo)
+    
+    crop_start = None
+    crop_rect = None
+    template_box = None
+    
+    def start_crop(event):
+        nonlocal crop_start, crop_rect
+        crop_start = (event.x, event.y)
+        if crop_rect:
+            canvas.delete(crop_rect)
+        crop_rect = canvas.create_rectangle(
+            event.x, event.y, event.x, event.y,
+            outline='red'
+        )
+    
+    def update_crop(event):
+        nonlocal crop_rect
+        if crop_start:
+            canvas.coords(crop_rect, crop_start[0], crop_start[1], event.x, event.y)
+    
+    def end_crop(event):
+        nonlocal crop_start, template_box
+        if crop_start:
+            x1, y1 = crop_start
+            x2, y2 = event.x, event.y
+            if choice == "3":
+                template_box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+                window.destroy()
+                return
+            area_key = "message_area" if choice == "1" else "username_area"
+            monitor.config[area_key] = {
+                "left": monitor.config[area_key]["left"] + min(x1, x2),
+                "top": monitor.config[area_key]["top"] + min(y1, y2),
+                "width": abs(x2 - x1),
+                "height": abs(y2 - y1)
+            }
+            monitor.save_config()
+            window.destroy()
+    
+    canvas.bind("<ButtonPress-1>", start_crop)
+    canvas.bind("<B1-Motion>", update_crop)
+    canvas.bind("<ButtonRelease-1>", end_crop)
+    
+    window.photo = photo
+    window.mainloop()
+
+    if template_box is not None:
+        save_keyword_template(monitor, screenshot.crop(template_box))
+
+def save_keyword_template(monitor, crop):
+    keyword = input("\nKeyword shown in the selection: ").strip()
+    if not keyword:
+        print("No keyword entered, template discarded")
+        return
+    os.makedirs("templates", exist_ok=True)
+    templates = monitor.config.setdefault("keyword_templates", {})
+    paths = templates.setdefault(keyword, [])
+    safe_name = "".join(char if char.isalnum() else "_" for char in keyword)
+    path = os.path.join("templates", f"{safe_name}-{len(paths) + 1}.png")
+    crop.save(path)
+    paths.append(path)
+    monitor.save_config()
+    monitor.compile_keywords()
+    print(f"Saved template for '{keyword}' to {path}")
+    if monitor.config.get("detection_engine", "ocr") != "template":
+        print("Set detection_engine to \"template\" in the config to use templates while monitoring")
+
+def run_menu(monitor):
+    header = pyfiglet.figlet_format("Discord Trigger Message", font="standard")
+
+    while True:
+        os.system('cls' if os.name == 'nt' else 'clear')
+        
+        print(header)
+        print("Developed by 8wp".center(80))
+        print("\n" + "="*80 + "\n")
+
+        menu_items = [
+            ["1", "Start monitoring", "Begin monitoring Discord messages"],
+            ["2", "Calibrate message area", "Set up the screen area to monitor"],
+            ["3", "Calibrate username area", "Set up the username area to monitor"],
+            ["4", "Edit configuration", "Modify monitor settings"],
+            ["5", "View current settings", "Display current configuration"],
+            ["6", "Send test message", "Test Discord connectivity"],
+            ["7", "Optimize OCR settings", "Adjust text recognition settings"],
+            ["8", "View/Crop OCR area", "Preview and adjust monitored areas"],
+            ["9", "Exit", "Close the application"]
+        ]
+        
+        print(tabulate(menu_items, headers=["Option", "Action", "Description"], 
+                     tablefmt="fancy_grid", colalign=("center", "left", "left")))
+
+        choice = input("\nSelect option: ")
+
+        if choice == "1":
+            if not monitor.config["discord_token"] or not all(rule.channel_id for rule in monitor.trigger_rules()):
+                print("\nWarning: Discord token or channel ID not configured!")
+                print("Please configure Discord settings before starting.")
+                input("\nPress Enter to continue...")
+                continue
+            monitor.start_monitoring()
+        elif choice == "2":
+            monitor.calibrate_message_area()
+        elif choice == "3":
+            monitor.calibrate_username_area()
+        elif choice == "4":
+            monitor.edit_config()
+        elif choice == "5":
+            print("\nCurrent configuration:")
+            config_display = monitor.config.copy()
+            if config_display["discord_token"]:
+                config_display["discord_token"] = "*" * len(config_display["discord_token"])
+            formatted_config = [[k, str(v)] for k, v in config_display.items()]
+            print(tabulate(formatted_config, headers=["Setting", "Value"], 
+                         tablefmt="fancy_grid", colalign=("left", "left")))
+        elif choice == "6":
+            monitor.test_message()
+        elif choice == "7":
+            monitor.optimize_ocr()
+        elif choice == "8":
+            monitor.view_ocr_area()
+        elif choice == "9":
+            monitor.ocr.close()
+            if monitor.sender is not None:
+                monitor.sender.close()
+            print("\nThank you for using Discord Trigger Message!")
+            print("Exiting...")
+            break
+
+        if choice != "9":
+            input("\nPress Enter to continue...")
@@ -0,0 +1,57 @@
+import json
+import os
+
+from discord_trigger_message import dedup
+from discord_trigger_message.dedup import DedupStore, message_fingerprint
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+def test_fingerprints_expire_ttl_after_they_were_last_seen(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(dedup.time, "time", clock.time)
+    store = DedupStore(ttl=10)
+    store.add("a")
+    clock.now += 8
+    store.touch("a")
+    clock.now += 8
+    assert "a" in store
+    clock.now += 3
+    assert "a" not in store
+    store.prune()
+    assert len(store) == 0
+
+def test_least_recently_seen_fingerprints_are_evicted_first():
+    store = DedupStore(max_entries=2)
+    store.add("a")
+    store.add("b")
+    store.touch("a")
+    store.add("c")
+    assert "a" in store and "c" in store
+    assert "b" not in store
+
+def test_saved_store_is_reloaded_without_expired_entries(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(dedup.time, "time", clock.time)
+    path = str(tmp_path / "dedup_store.json")
+    store = DedupStore(ttl=10, path=path)
+    store.add("old")
+    clock.now += 6
+    store.add("new")
+    store.save()
+    assert not os.path.exists(path + ".tmp")
+    with open(path) as f:
+        assert set(json.load(f)) == {"old", "new"}
+
+    clock.now += 6
+    reloaded = DedupStore(ttl=10, path=path)
+    reloaded.load()
+    assert list(reloaded.entries) == ["new"]
+
+def test_fingerprint_ignores_light_ocr_noise():
+    assert message_fingerprint("default", "alice", "Giveaway, NOW") == message_fingerprint("default", "alice", "giveaway n0w")
+    assert message_fingerprint("default", "alice", "giveaway") != message_fingerprint("default", "bob", "giveaway")
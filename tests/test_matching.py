@@ -0,0 +1,84 @@
+import random
+import time
+
+from discord_trigger_message.matching import (
+    FuzzyKeywordIndex, KeywordMatcher, bounded_edit_distance, normalize_ocr_text
+)
+
+LETTERS = "abcdefghjkmnopqrstuvwxyz"
+
+def random_word(rng, shortest, longest, letters=LETTERS):
+    return "".join(rng.choice(letters) for _ in range(rng.randint(shortest, longest)))
+
+def noisy(rng, text, edits):
+    for _ in range(edits):
+        position = rng.randrange(len(text))
+        operation = rng.choice("sdi")
+        if operation == "s":
+            text = text[:position] + rng.choice(LETTERS) + text[position + 1:]
+        elif operation == "d" and len(text) > 1:
+            text = text[:position] + text[position + 1:]
+        else:
+            text = text[:position] + rng.choice(LETTERS) + text[position:]
+    return text
+
+def test_aho_corasick_agrees_with_substring_search():
+    rng = random.Random(4)
+    for _ in range(200):
+        keywords = [random_word(rng, 1, 4, "abcAB") for _ in range(rng.randint(1, 8))]
+        text = random_word(rng, 0, 40, "abcAB ")
+        expected = {keyword for keyword in keywords if keyword.lower() in text.lower()}
+        assert set(KeywordMatcher(keywords).match(text)) == expected
+        expected = {keyword for keyword in keywords if keyword in text}
+        assert set(KeywordMatcher(keywords, case_sensitive=True).match(text)) == expected
+
+def test_whole_word_matching():
+    matcher = KeywordMatcher(["cat", "hot dog"], whole_word=True)
+    assert matcher.match("concatenate hot dogs") == []
+    assert matcher.match("the cat ate a hot dog.") == ["cat", "hot dog"]
+
+def test_fuzzy_matches_ocr_noise():
+    matcher = KeywordMatcher.from_config({"fuzzy_matching": True, "fuzzy_max_distance": 1}, keywords=["giveaway", "free nitro", "gg"])
+    assert matcher.match("GIVEAVVAY starts now") == ["giveaway"]
+    assert matcher.match("get fre3 nitr0 here") == ["free nitro"]
+    assert matcher.match("g9 everyone") == []
+
+def test_fuzzy_index_agrees_with_brute_force():
+    rng = random.Random(7)
+    keywords = [random_word(rng, 3, 12) for _ in range(60)] + [random_word(rng, 3, 6) + " " + random_word(rng, 3, 6) for _ in range(20)]
+    distances = {keyword: rng.randint(0, 3) for keyword in keywords[::5]}
+    index = FuzzyKeywordIndex(keywords, max_distance=2, distances=distances)
+
+    for _ in range(300):
+        words = [random_word(rng, 2, 9) for _ in range(rng.randint(1, 10))]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), noisy(rng, rng.choice(keywords), rng.randint(0, 3)))
+        line = " ".join(words)
+
+        tokens = normalize_ocr_text(line).split()
+        expected = set()
+        for keyword in keywords:
+            normalized = normalize_ocr_text(keyword)
+            limit = min(distances.get(keyword, 2), len(normalized) // 4)
+            size = len(normalized.split())
+            for start in range(len(tokens) - size + 1):
+                if bounded_edit_distance(" ".join(tokens[start:start + size]), normalized, limit) <= limit:
+                    expected.add(keyword)
+        assert set(index.match(line)) == expected, line
+
+def test_fuzzy_matching_stays_well_under_a_millisecond_per_line():
+    rng = random.Random(1)
+    keywords = ([random_word(rng, 4, 14) for _ in range(300)]
+                + [random_word(rng, 4, 8) + " " + random_word(rng, 4, 8) for _ in range(40)]
+                + [" ".join(random_word(rng, 3, 6) for _ in range(3)) for _ in range(10)])
+    lines = [" ".join(random_word(rng, 2, 10) for _ in range(rng.randint(5, 14))) for _ in range(300)]
+    index = FuzzyKeywordIndex(keywords, max_distance=2)
+
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for line in lines:
+            index.match(line)
+        elapsed = (time.perf_counter() - start) / len(lines)
+        best = elapsed if best is None else min(best, elapsed)
+    assert best < 0.0005
@@ -0,0 +1,158 @@
+import json
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from discord_trigger_message.monitor import DiscordMonitor
+from discord_trigger_message.ocr import attribute_lines, group_words
+
+@pytest.fixture
+def make_monitor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def make(**settings):
+        DiscordMonitor(config_path="monitor_config.json")
+        with open("monitor_config.json", "r") as f:
+            config = json.load(f)
+        config.update(settings)
+        for key in [key for key, value in config.items() if value is None]:
+            del config[key]
+        with open("monitor_config.json", "w") as f:
+            json.dump(config, f)
+        return DiscordMonitor(config_path="monitor_config.json")
+    return make
+
+def test_body_lines_ending_in_a_time_are_not_headers():
+    lines = attribute_lines([
+        "alice  Today at 12:05",
+        "giveaway starts at 8:00 pm",
+        "meet at 5:30pm",
+        "party on 12/25/24",
+        "bob — Yesterday at 9:41 PM",
+        "hi",
+        "carol 12/25/2024 3:15 PM",
+        "gg"
+    ])
+    assert lines == [
+        ("alice", "alice  Today at 12:05"),
+        ("alice", "giveaway starts at 8:00 pm"),
+        ("alice", "meet at 5:30pm"),
+        ("alice", "party on 12/25/24"),
+        ("bob", "bob — Yesterday at 9:41 PM"),
+        ("bob", "hi"),
+        ("carol", "carol 12/25/2024 3:15 PM"),
+        ("carol", "gg")
+    ]
+
+def test_lowercase_stamp_in_body_text_is_not_a_header():
+    lines = attribute_lines(["alice  Today at 12:05", "giveaway today at 8:00 pm", "raid tomorrow"])
+    assert [author for author, _ in lines] == ["alice", "alice", "alice"]
+
+def boxes(top, *runs):
+    """Word boxes for (text, character width) runs laid out left to right"""
+    words = []
+    left = 0
+    for text, width in runs:
+        for word in text.split():
+            words.append({"text": word, "top": top, "left": left, "height": 12, "width": width * len(word)})
+            left += width * (len(word) + 1)
+    return words
+
+def test_headers_need_the_smaller_timestamp_font():
+    lines = group_words(
+        boxes(0, ("alice", 8), ("Today at 12:05 PM", 6))
+        + boxes(20, ("giveaway Today at 8:00 PM", 8))
+        + boxes(40, ("raid tomorrow", 8))
+        + boxes(60, ("bob", 8), ("Yesterday at 9:41 PM", 6))
+        + boxes(80, ("gg", 8))
+    )
+    assert attribute_lines(lines) == [
+        ("alice", "alice Today at 12:05 PM"),
+        ("alice", "giveaway Today at 8:00 PM"),
+        ("alice", "raid tomorrow"),
+        ("bob", "bob Yesterday at 9:41 PM"),
+        ("bob", "gg")
+    ]
+
+def test_trigger_from_target_survives_a_body_line_shaped_like_a_header(make_monitor):
+    monitor = make_monitor(keywords=["raid"], response="hi", target_usernames=["alice"], username_mode="layout")
+    sent = []
+    lines = attribute_lines(["alice  Today at 12:05", "giveaway today at 8:00 pm", "raid tomorrow"])
+    monitor.process_lines(lines, dispatch=lambda message, *args: sent.append(message))
+    assert sent == ["hi"]
+
+def test_configs_without_username_mode_keep_the_username_area(make_monitor):
+    monitor = make_monitor(target_username="alice", username_mode=None)
+    assert "username" in monitor.capture_areas()
+
+@pytest.mark.parametrize("targets", [[], ["alice"]])
+def test_keyword_in_a_line_ending_in_a_time_triggers(make_monitor, targets):
+    monitor = make_monitor(keywords=["giveaway"], response="hi", target_usernames=targets)
+    sent = []
+    lines = attribute_lines(["alice  Today at 12:05", "giveaway starts at 8:00 pm"])
+    assert monitor.process_lines(lines, dispatch=lambda message, *args: sent.append(message))
+    assert sent == ["hi"]
+
+class StillFrameSource:
+    exhausted = False
+
+    def __init__(self):
+        self.shade = 0
+
+    def capture(self, areas):
+        return {name: Image.new("RGB", (area["width"], area["height"]), (self.shade, 0, 0)) for name, area in areas.items()}
+
+class LinesOCR:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def image_to_data(self, image, config=""):
+        return [{"text": line, "top": index * 20, "left": 0, "height": 10, "width": 10} for index, line in enumerate(self.lines)]
+
+def test_message_kept_on_screen_does_not_expire_while_frames_are_skipped(make_monitor):
+    monitor = make_monitor(rules=[{"name": "give", "keywords": ["giveaway"], "response": "hi", "rearm": "cooldown"}],
+                           dedup_ttl=0.05, band_ocr=False)
+    monitor.ocr = LinesOCR(["giveaway now"])
+    monitor.frame_source = source = StillFrameSource()
+    monitor.initial_scan = False
+    sent = []
+
+    def tick():
+        monitor.check_for_message(dispatch=lambda message, *args: sent.append(message))
+
+    tick()
+    for _ in range(10):
+        time.sleep(0.02)
+        tick()
+    assert monitor.frames_skipped == 10
+
+    monitor.ocr.lines = ["giveaway now", "something else"]
+    source.shade = 200
+    tick()
+    assert sent == ["hi"]
+
+def test_config_reload_keeps_fired_once_rules_fired(make_monitor):
+    monitor = make_monitor(keywords=["giveaway"], response="hi")
+    sent = []
+    monitor.process_lines([(None, "giveaway now")], dispatch=lambda message, *args: sent.append(message))
+    assert monitor.has_responded
+
+    with open("monitor_config.json", "r") as f:
+        config = json.load(f)
+    config["scan_interval"] = 0.05
+    with open("monitor_config.json", "w") as f:
+        json.dump(config, f)
+    assert monitor.reload_config()
+
+    assert monitor.has_responded
+    assert monitor.regions[0].triggers == 1
+    monitor.process_lines([(None, "another giveaway")], dispatch=lambda message, *args: sent.append(message))
+    assert sent == ["hi"]
+
+def test_persisted_dedup_store_lives_next_to_the_config(make_monitor, tmp_path):
+    monitor = make_monitor(dedup_persist=True)
+    assert monitor.processed_messages.path == os.path.join(str(tmp_path), "dedup_store.json")
+    monitor = make_monitor(dedup_persist=True, dedup_path="elsewhere.json")
+    assert monitor.processed_messages.path == "elsewhere.json"
@@ -0,0 +1,46 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from discord_trigger_message.ocr import BandOCR
+
+SETTINGS = {"scale": 1.0, "resample": "bilinear", "binarize": "otsu", "invert": "auto"}
+
+class RowOCR:
+    """Reports one word per run of dark rows, like tesseract would for a line of text"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def image_to_data(self, image, config=""):
+        self.calls += 1
+        rows = np.flatnonzero((np.asarray(image.convert("L")) < 128).any(axis=1))
+        words = []
+        for run in np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1):
+            if run.size:
+                words.append({"text": f"w{len(words)}", "top": int(run[0]), "left": 0,
+                              "width": 10, "height": int(run[-1] - run[0] + 1)})
+        return words
+
+def chat(rows):
+    image = Image.new("RGB", (200, 30 * rows + 10), (49, 51, 56))
+    draw = ImageDraw.Draw(image)
+    for row in range(rows):
+        draw.rectangle((10 + row * 5, 10 + row * 30, 120, 22 + row * 30), outline=(219, 222, 225))
+    return image
+
+def test_new_bands_are_recognized_in_one_call():
+    ocr = RowOCR()
+    band_ocr = BandOCR(ocr)
+
+    assert [line["text"] for line in band_ocr.recognize(chat(3), "--psm 4", SETTINGS)] == ["w0", "w1", "w2"]
+    assert ocr.calls == 1
+    assert band_ocr.bands_recognized == 3
+
+    assert len(band_ocr.recognize(chat(4), "--psm 4", SETTINGS)) == 4
+    assert ocr.calls == 2
+    assert band_ocr.bands_reused == 3
+
+def test_single_line_modes_recognize_bands_separately():
+    ocr = RowOCR()
+    assert len(BandOCR(ocr).recognize(chat(3), "--psm 7", SETTINGS)) == 3
+    assert ocr.calls == 3
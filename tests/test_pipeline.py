@@ -0,0 +1,65 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from discord_trigger_message.pipeline import MonitorPipeline
+
+class StubMonitor:
+    """Records the order jobs are recognized in; the first job waits until released"""
+
+    def __init__(self):
+        self.order = []
+        self.release = threading.Event()
+        self.on_recognize = None
+
+    def recognize_frame(self, job):
+        self.order.append(job["id"])
+        if len(self.order) == 1:
+            self.release.wait(5)
+        if self.on_recognize is not None:
+            self.on_recognize(job)
+        return None
+
+def job(region, number):
+    return {"region": region, "id": f"{region.name}{number}", "captured_at": 0.0}
+
+def wait_for(monitor, count):
+    deadline = time.monotonic() + 5
+    while len(monitor.order) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_waiting_regions_keep_only_their_newest_frame():
+    monitor = StubMonitor()
+    pipeline = MonitorPipeline(monitor, workers=1)
+    a, b, c = (SimpleNamespace(name=name) for name in "abc")
+    try:
+        for submitted in (job(a, 1), job(a, 2), job(a, 3), job(b, 1), job(c, 1), job(b, 2)):
+            pipeline.submit(submitted)
+        monitor.release.set()
+        wait_for(monitor, 4)
+    finally:
+        pipeline.stop()
+    assert monitor.order == ["a1", "a3", "b2", "c1"]
+    assert pipeline.frames_dropped == 2
+    assert pipeline.in_flight == 0
+
+def test_busy_region_cannot_starve_the_others():
+    monitor = StubMonitor()
+    pipeline = MonitorPipeline(monitor, workers=1)
+    a, b, c = (SimpleNamespace(name=name) for name in "abc")
+    numbers = iter(range(2, 5))
+
+    def resubmit(recognized):
+        if recognized["region"] is a:
+            number = next(numbers, None)
+            if number is not None:
+                pipeline.submit(job(a, number))
+    monitor.on_recognize = resubmit
+    try:
+        for submitted in (job(a, 1), job(b, 1), job(c, 1)):
+            pipeline.submit(submitted)
+        monitor.release.set()
+        wait_for(monitor, 6)
+    finally:
+        pipeline.stop()
+    assert monitor.order == ["a1", "b1", "c1", "a2", "a3", "a4"]
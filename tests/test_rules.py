@@ -0,0 +1,53 @@
+from discord_trigger_message.rules import RuleSet, TriggerRule
+
+def test_once_rule_fires_a_single_time():
+    rule = TriggerRule("give", keywords=["giveaway"])
+    assert rule.armed(0.0)
+    rule.fire(0.0)
+    assert not rule.armed(1000.0)
+    rule.reset()
+    assert rule.armed(0.0)
+
+def test_cooldown_rule_rearms_after_its_cooldown():
+    rule = TriggerRule("raid", keywords=["raid"], cooldown=10, rearm="cooldown")
+    rule.fire(100.0)
+    assert not rule.armed(105.0)
+    assert rule.armed(110.0)
+
+def test_keyword_shared_by_two_rules_hits_both():
+    first = TriggerRule("first", keywords=["drop", "loot"])
+    second = TriggerRule("second", keywords=["drop"], patterns=[r"\bboss\b"])
+    rules = RuleSet([first, second], {})
+    assert rules.match("boss drop incoming") == [(first, ["drop"]), (second, ["drop", r"\bboss\b"])]
+    assert rules.match("nothing here") == []
+
+def test_exhausted_only_when_every_rule_is_a_fired_once_rule():
+    once = TriggerRule("once", keywords=["a"])
+    other = TriggerRule("other", keywords=["b"])
+    cooldown = TriggerRule("cooldown", keywords=["c"], rearm="cooldown")
+    assert not RuleSet([], {}).exhausted
+
+    rules = RuleSet([once, other], {})
+    once.fire(0.0)
+    assert not rules.exhausted
+    other.fire(0.0)
+    assert rules.exhausted
+    rules.reset()
+    assert not rules.exhausted
+
+    mixed = RuleSet([once, cooldown], {})
+    once.fire(0.0)
+    cooldown.fire(0.0)
+    assert not mixed.exhausted
+
+def test_legacy_settings_become_the_default_rule():
+    rules = RuleSet.from_config({
+        "keywords": ["hello"],
+        "response": "hi",
+        "channel_id": "1",
+        "rules": [{"keywords": "bye", "response": "cya", "rearm": "cooldown", "cooldown": 5}]
+    })
+    assert [(rule.name, rule.keywords, rule.response, rule.channel_id, rule.rearm) for rule in rules.rules] == [
+        ("default", ["hello"], "hi", "1", "once"),
+        ("rule 1", ["bye"], "cya", "1", "cooldown")
+    ]
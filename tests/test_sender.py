@@ -0,0 +1,58 @@
+import json
+
+import pytest
+import requests
+
+from discord_trigger_message import sender as sender_module
+from discord_trigger_message.sender import DiscordSender
+
+def response(status, headers=None, body=None):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    result._content = json.dumps(body or {}).encode("utf-8")
+    return result
+
+@pytest.fixture
+def make_sender(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(sender_module.time, "sleep", sleeps.append)
+
+    def make(responses, max_retries=3):
+        sender = DiscordSender("token", max_retries=max_retries)
+        sender.requests = []
+        replies = iter(responses)
+
+        def send(request, timeout=None):
+            sender.requests.append(request)
+            return next(replies)
+        sender.session.send = send
+        return sender, sleeps
+    return make
+
+def test_retry_after_header_is_honoured(make_sender):
+    sender, sleeps = make_sender([response(429, {"Retry-After": "0.5"}), response(200)])
+    assert sender.send("1", "hi").status_code == 200
+    assert sleeps == [0.5]
+    assert len(sender.requests) == 2
+    assert json.loads(sender.requests[1].body) == {"content": "hi"}
+    assert sender.requests[1].url.endswith("/channels/1/messages")
+
+def test_retry_after_falls_back_to_the_json_body(make_sender):
+    sender, sleeps = make_sender([response(429, body={"retry_after": 1.25}), response(200)])
+    sender.send("1", "hi")
+    assert sleeps == [1.25]
+
+def test_gives_up_after_max_retries(make_sender):
+    sender, sleeps = make_sender([response(429, {"Retry-After": "2"})] * 3, max_retries=2)
+    with pytest.raises(requests.HTTPError):
+        sender.send("1", "hi")
+    assert len(sender.requests) == 3
+    assert sleeps == [2.0, 2.0]
+
+def test_other_errors_are_not_retried(make_sender):
+    sender, sleeps = make_sender([response(403)])
+    with pytest.raises(requests.HTTPError):
+        sender.send("1", "hi")
+    assert len(sender.requests) == 1
+    assert sleeps == []
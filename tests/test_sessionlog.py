@@ -0,0 +1,22 @@
+from discord_trigger_message.sessionlog import SessionLog
+
+def test_first_batch_is_counted_once(tmp_path):
+    log = SessionLog(str(tmp_path / "session_log.jsonl"))
+    log.write([
+        {"t": "2024-01-01T10:00:00", "type": "trigger", "region": "main", "rule": "default"},
+        {"t": "2024-01-01T10:05:00", "type": "session_end", "session": {}}
+    ])
+
+    summary = log.stats()
+    assert (summary["sessions"], summary["triggers"]) == (1, 1)
+    rebuilt = SessionLog(str(tmp_path / "session_log.jsonl")).stats(rebuild=True)
+    assert (rebuilt["sessions"], rebuilt["triggers"]) == (1, 1)
+
+def test_batch_after_a_lost_index_is_counted_once(tmp_path):
+    path = str(tmp_path / "session_log.jsonl")
+    SessionLog(path).write([{"t": "2024-01-01T10:00:00", "type": "session_end", "session": {}}])
+    (tmp_path / "session_log.jsonl.index.json").unlink()
+
+    log = SessionLog(path)
+    log.write([{"t": "2024-01-01T11:00:00", "type": "session_end", "session": {}}])
+    assert log.stats()["sessions"] == 2